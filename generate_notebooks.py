@@ -1,5 +1,7 @@
 import os
+import copy
 import json
+from concurrent.futures import ThreadPoolExecutor
 
 # Configuration
 REPO_USER = "traikdude"
@@ -20,91 +22,109 @@ SCRIPTS = [
     "TextExpanderCategorizer.py"
 ]
 
+# Scripts run inside the notebook kernel instead of a `!python` subprocess, so
+# their charts render inline and their helper functions stay callable
+KERNEL_SCRIPTS = {
+    "AnalyticsDashboard.py",
+}
+
 # Ensure output directory exists
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# Setup Cell: Mount Drive & Clone Repo (identical for every script)
+SETUP_CELL = [
+    "# 🚀 MOUNT GOOGLE DRIVE\n",
+    "from google.colab import drive\n",
+    "drive.mount('/content/drive')\n",
+    "\n",
+    "# 📥 CLONE REPOSITORY\n",
+    f"!git clone https://github.com/{REPO_USER}/{REPO_NAME}.git\n",
+    f"%cd {REPO_NAME}/{TOOLS_DIR}\n",
+    "\n",
+    "# 📦 INSTALL DEPENDENCIES\n",
+    "!pip install -r requirements.txt"
+]
+
+# Notebook JSON Structure (shared by every script; sources filled per script)
+BASE_NOTEBOOK = {
+    "nbformat": 4,
+    "nbformat_minor": 0,
+    "metadata": {
+        "colab": {
+            "name": None,
+            "provenance": []
+        },
+        "kernelspec": {
+            "name": "python3",
+            "display_name": "Python 3"
+        },
+        "accelerator": "GPU"
+    },
+    "cells": [
+        {
+            "cell_type": "markdown",
+            "metadata": {},
+            "source": []
+        },
+        {
+            "cell_type": "code",
+            "execution_count": None,
+            "metadata": {},
+            "outputs": [],
+            "source": SETUP_CELL
+        },
+        {
+            "cell_type": "code",
+            "execution_count": None,
+            "metadata": {},
+            "outputs": [],
+            "source": []
+        }
+    ]
+}
+
 def create_notebook_content(script_name):
     """Generates the JSON structure for a Colab notebook."""
     
-    # 1. Setup Cell: Mount Drive & Clone Repo
-    setup_code = [
-        "# 🚀 MOUNT GOOGLE DRIVE\n",
-        "from google.colab import drive\n",
-        "drive.mount('/content/drive')\n",
-        "\n",
-        "# 📥 CLONE REPOSITORY\n",
-        f"!git clone https://github.com/{REPO_USER}/{REPO_NAME}.git\n",
-        f"%cd {REPO_NAME}/{TOOLS_DIR}\n",
-        "\n",
-        "# 📦 INSTALL DEPENDENCIES\n",
-        "!pip install -r requirements.txt"
-    ]
-
-    # 2. Execution Cell: Run the specific script
+    # Execution Cell: Run the specific script (the setup cell is shared)
+    run_command = "%run" if script_name in KERNEL_SCRIPTS else "!python"
     run_code = [
         f"# 🏃‍♂️ RUN {script_name.upper()}\n",
-        f"!python {script_name}"
+        f"{run_command} {script_name}"
     ]
 
-    # Notebook JSON Structure
-    notebook = {
-        "nbformat": 4,
-        "nbformat_minor": 0,
-        "metadata": {
-            "colab": {
-                "name": script_name.replace(".py", ""),
-                "provenance": []
-            },
-            "kernelspec": {
-                "name": "python3",
-                "display_name": "Python 3"
-            },
-            "accelerator": "GPU"
-        },
-        "cells": [
-            {
-                "cell_type": "markdown",
-                "metadata": {},
-                "source": [
-                    f"# 🧙🏾‍♂️ {script_name} - Colab Edition\n",
-                    "Run this notebook to execute the script directly from your Google Drive/Sheet integration."
-                ]
-            },
-            {
-                "cell_type": "code",
-                "execution_count": None,
-                "metadata": {},
-                "outputs": [],
-                "source": setup_code
-            },
-            {
-                "cell_type": "code",
-                "execution_count": None,
-                "metadata": {},
-                "outputs": [],
-                "source": run_code
-            }
-        ]
-    }
+    notebook = copy.deepcopy(BASE_NOTEBOOK)
+    notebook["metadata"]["colab"]["name"] = script_name.replace(".py", "")
+    notebook["cells"][0]["source"] = [
+        f"# 🧙🏾‍♂️ {script_name} - Colab Edition\n",
+        "Run this notebook to execute the script directly from your Google Drive/Sheet integration."
+    ]
+    notebook["cells"][2]["source"] = run_code
     return notebook
 
-print(f"STARTING NOTEBOOK GENERATION...")
-generated_urls = []
-
-for script in SCRIPTS:
+def write_notebook(script):
+    """Writes one script's notebook and returns (script, file_path, colab_url)."""
     notebook_name = script.replace(".py", ".ipynb")
     file_path = os.path.join(OUTPUT_DIR, notebook_name)
     
     content = create_notebook_content(script)
     
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(content, f, indent=2)
-        
-    print(f"Generated: {file_path}")
+    # Compact JSON, encoded once and written as a single bytes payload
+    with open(file_path, 'wb') as f:
+        f.write(json.dumps(content, separators=(',', ':')).encode('utf-8'))
     
     # Generate the GitHub->Colab URL
     colab_url = f"https://colab.research.google.com/github/{REPO_USER}/{REPO_NAME}/blob/{BRANCH}/{OUTPUT_DIR}/{notebook_name}"
-    generated_urls.append((script, colab_url))
+    return script, file_path, colab_url
+
+print(f"STARTING NOTEBOOK GENERATION...")
+generated_urls = []
+
+# Each notebook is independent file I/O, so write them concurrently
+with ThreadPoolExecutor(max_workers=8) as executor:
+    for script, file_path, colab_url in executor.map(write_notebook, SCRIPTS):
+        print(f"Generated: {file_path}")
+        generated_urls.append((script, colab_url))
 
 print("\n" + "="*60)
 print("FINAL COLAB URLs (COPY THESE FOR YOUR GOOGLE SHEET)")
@@ -46,22 +46,51 @@ IN_COLAB = compat.in_colab
 # %%
 import gspread
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import numpy as np
+import importlib.util
+from functools import lru_cache
 from pathlib import Path
-from collections import Counter
 import warnings
 warnings.filterwarnings('ignore')
 
-try:
-    import plotly.express as px
-    import plotly.graph_objects as go
-    PLOTLY_AVAILABLE = True
-except ImportError:
-    PLOTLY_AVAILABLE = False
-
-plt.style.use('seaborn-v0_8-whitegrid')
-sns.set_palette("husl")
+# Visualization libraries are imported lazily inside the functions that use
+# them; here we only check they exist (without paying their import cost)
+PLOTLY_AVAILABLE = importlib.util.find_spec("plotly") is not None
+KALEIDO_AVAILABLE = importlib.util.find_spec("kaleido") is not None
+
+@lru_cache(maxsize=None)
+def get_pyplot():
+    """Import matplotlib on first use and apply the dashboard style once! 🎨"""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    plt.style.use('seaborn-v0_8-whitegrid')
+    sns.set_palette("husl")
+    return plt
+
+def save_plotly_png(fig, filename):
+    """Export the Plotly figure straight to PNG via Kaleido (local mode)! 💾"""
+    if IN_COLAB or not KALEIDO_AVAILABLE:
+        return
+    try:
+        fig.write_image(os.path.join(OUTPUT_FOLDER, filename), width=1000, height=600)
+        safe_print(f"✅ Saved: {filename}")
+    except Exception as e:
+        safe_print(f"⚠️ Could not save {filename}: {e}")
+
+@lru_cache(maxsize=None)
+def get_plotly_io():
+    """Import plotly.io and pin the renderer once for the whole session! 🖥️"""
+    import plotly.io as pio
+    if IN_COLAB:
+        pio.renderers.default = "colab"
+    return pio
+
+def show_figure(fig, filename=None):
+    """Show a Plotly figure with the pinned renderer and save it locally! 📊"""
+    get_plotly_io()
+    fig.show()
+    if filename:
+        save_plotly_png(fig, filename)
 
 safe_print("✅ Libraries imported!")
 
@@ -104,17 +133,97 @@ OUTPUT_FOLDER = "/content" if IN_COLAB else str(Path.cwd())
 
 # Initialize dataframe
 df = None
+COLS = frozenset()
+CAT_COUNTS = pd.Series(dtype='int64')
+SUBCAT_COUNTS = pd.Series(dtype='int64')
+
+# Columns the charts below expect from the Shortcuts sheet
+REQUIRED_COLUMNS = frozenset({'MainCategory', 'Subcategory', 'Language', 'Content', 'Snippet Name'})
+
+def text_length(series):
+    """Vectorized character count, only stringifying non-text cells! 📏"""
+    try:
+        lengths = series.str.len()
+    except AttributeError:
+        # No string cells at all (e.g. an all-numeric column)
+        lengths = series.map(str, na_action='ignore').str.len()
+    else:
+        non_text = lengths.isna() & series.notna()
+        if non_text.any():
+            lengths.loc[non_text] = series[non_text].map(str).str.len()
+    return lengths.fillna(0).astype('int32')
+
+def fill_blank(series, fill):
+    """Replace missing AND empty cells in a single masked pass! 🧹"""
+    return series.mask(series.isna() | (series == ''), fill)
+
+def length_stats(lengths):
+    """Min/max/mean of a length array, each computed exactly once! 📐"""
+    if lengths.size == 0:
+        return {'min': 0, 'max': 0, 'mean': 0.0}
+    return {
+        'min': int(lengths.min()),
+        'max': int(lengths.max()),
+        'mean': float(lengths.mean())
+    }
+
+# Source column -> (cleaned column, label for blank cells)
+CLEAN_COLUMNS = {
+    'MainCategory': ('MainCategoryClean', 'Uncategorized'),
+    'Subcategory': ('SubcategoryClean', 'Other'),
+    'Language': ('LanguageClean', '(not set)'),
+}
+
+def prepare_dataframe(frame):
+    """Add computed columns once at load time so charts can share them! 🧮"""
+    frame['content_length'] = text_length(frame['Content']) if 'Content' in frame.columns else 0
+    frame['name_length'] = text_length(frame['Snippet Name']) if 'Snippet Name' in frame.columns else 0
+    
+    # Low-cardinality labels become category dtype (integer codes per row)
+    for source, (target, fill) in CLEAN_COLUMNS.items():
+        if source in frame.columns:
+            frame[target] = fill_blank(frame[source], fill).astype('category')
+            frame[source] = frame[source].astype('category')
+    
+    return frame
 
-try:
+def load_df():
+    """Fetch the Shortcuts sheet into a prepared DataFrame! 📥"""
     spreadsheet = gc.open_by_key(SPREADSHEET_ID)
     worksheet = spreadsheet.worksheet(SHEET_NAME)
-    data = worksheet.get_all_records()
-    df = pd.DataFrame(data)
-    
-    # Add computed columns
-    df['content_length'] = df['Content'].astype(str).str.len() if 'Content' in df.columns else 0
-    df['name_length'] = df['Snippet Name'].astype(str).str.len() if 'Snippet Name' in df.columns else 0
-    
+    # Rectangular list-of-lists: header row + data rows, no per-row dicts.
+    # UNFORMATTED_VALUE sends numbers as JSON numbers instead of display strings
+    rows = worksheet.get_values(value_render_option='UNFORMATTED_VALUE')
+    frame = pd.DataFrame(rows[1:], columns=rows[0]) if rows else pd.DataFrame()
+    return prepare_dataframe(frame)
+
+def validate_schema(frame):
+    """Snapshot the column set once and report missing columns up front! 🔎"""
+    cols = frozenset(frame.columns)
+    missing = REQUIRED_COLUMNS - cols
+    if missing:
+        safe_print(f"⚠️ Missing columns (related charts will be skipped): {', '.join(sorted(missing))}")
+    return cols
+
+def count_categories(frame):
+    """Count categories (and category pairs) once for every chart to share! 🔢"""
+    if 'MainCategoryClean' not in frame.columns:
+        return pd.Series(dtype='int64'), pd.Series(dtype='int64')
+    cat_counts = frame['MainCategoryClean'].value_counts()
+    if 'SubcategoryClean' not in frame.columns:
+        return cat_counts, pd.Series(dtype='int64')
+    # Single hash pass over the label pairs (no groupby sort)
+    subcat_counts = (
+        frame[['MainCategoryClean', 'SubcategoryClean']]
+        .value_counts(dropna=False)
+        .loc[lambda counts: counts > 0]  # drop unobserved category pairs
+    )
+    return cat_counts, subcat_counts
+
+try:
+    df = load_df()
+    COLS = validate_schema(df)
+    CAT_COUNTS, SUBCAT_COUNTS = count_categories(df)
     safe_print(f"✅ Loaded {len(df)} shortcuts!")
 except Exception as e:
     safe_print(f"❌ Error loading spreadsheet: {e}")
@@ -133,11 +242,11 @@ def create_overview():
     safe_print(f"\n📦 Total Shortcuts: {len(df)}")
     safe_print(f"📋 Total Columns: {len(df.columns)}")
     
-    if 'MainCategory' in df.columns:
+    if 'MainCategory' in COLS:
         cats = df['MainCategory'].nunique()
         safe_print(f"🏷️ Categories: {cats}")
     
-    if 'content_length' in df.columns:
+    if 'content_length' in COLS:
         safe_print(f"📏 Avg Content Length: {df['content_length'].mean():.1f} chars")
     
     return df.describe()
@@ -150,21 +259,23 @@ overview = create_overview()
 # %%
 def plot_category_distribution():
     """Create category distribution chart! 🥧"""
-    if 'MainCategory' not in df.columns:
+    if 'MainCategory' not in COLS:
         safe_print("❌ No MainCategory column!")
         return
     
-    cat_counts = df['MainCategory'].value_counts()
+    cat_counts = CAT_COUNTS
     
     if PLOTLY_AVAILABLE:
+        import plotly.express as px
         fig = px.pie(
             values=cat_counts.values,
             names=cat_counts.index,
             title="📊 Category Distribution",
             hole=0.4
         )
-        fig.show()
+        show_figure(fig, "category_distribution.png")
     else:
+        plt = get_pyplot()
         plt.figure(figsize=(10, 6))
         plt.pie(cat_counts.values, labels=cat_counts.index, autopct='%1.1f%%')
         plt.title("Category Distribution")
@@ -181,22 +292,32 @@ plot_category_distribution()
 # %%
 def plot_content_length():
     """Create content length histogram! 📏"""
-    if 'content_length' not in df.columns:
+    if 'content_length' not in COLS:
         safe_print("❌ No content length data!")
         return
     
+    lengths = df['content_length'].to_numpy()
+    
     if PLOTLY_AVAILABLE:
-        fig = px.histogram(
-            df,
-            x='content_length',
-            nbins=50,
+        import plotly.graph_objects as go
+        # Bin in NumPy so Plotly only receives 50 bars, not every row
+        counts, edges = np.histogram(lengths, bins=50)
+        fig = go.Figure(go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=counts,
+            width=np.diff(edges)
+        ))
+        fig.update_layout(
             title="📏 Content Length Distribution",
-            labels={'content_length': 'Characters'}
+            xaxis_title="Characters",
+            yaxis_title="count",
+            bargap=0
         )
-        fig.show()
+        show_figure(fig, "content_length.png")
     else:
+        plt = get_pyplot()
         plt.figure(figsize=(10, 6))
-        plt.hist(df['content_length'], bins=50, edgecolor='black')
+        plt.hist(lengths, bins=50, edgecolor='black')
         plt.xlabel('Content Length (chars)')
         plt.ylabel('Count')
         plt.title('Content Length Distribution')
@@ -217,13 +338,19 @@ def plot_category_sunburst():
         safe_print("⚠️ Plotly required for sunburst chart!")
         return
     
-    if 'MainCategory' not in df.columns:
+    if 'MainCategory' not in COLS:
         safe_print("❌ No MainCategory column!")
         return
     
+    import plotly.express as px
+    
     # Prepare data
-    if 'Subcategory' in df.columns:
-        sunburst_data = df.groupby(['MainCategory', 'Subcategory']).size().reset_index(name='count')
+    if 'Subcategory' in COLS:
+        sunburst_data = (
+            SUBCAT_COUNTS
+            .reset_index(name='count')
+            .rename(columns={'MainCategoryClean': 'MainCategory', 'SubcategoryClean': 'Subcategory'})
+        )
         fig = px.sunburst(
             sunburst_data,
             path=['MainCategory', 'Subcategory'],
@@ -231,7 +358,7 @@ def plot_category_sunburst():
             title="🌞 Category Hierarchy"
         )
     else:
-        cat_counts = df['MainCategory'].value_counts().reset_index()
+        cat_counts = CAT_COUNTS.reset_index()
         cat_counts.columns = ['MainCategory', 'count']
         fig = px.sunburst(
             cat_counts,
@@ -240,7 +367,7 @@ def plot_category_sunburst():
             title="🌞 Category Distribution"
         )
     
-    fig.show()
+    show_figure(fig, "category_sunburst.png")
 
 plot_category_sunburst()
 
@@ -248,25 +375,74 @@ plot_category_sunburst()
 # ## Step 8: Length by Category 📦
 
 # %%
+BOX_WHISKER_IQR = 1.5  # Same whisker rule as px.box / matplotlib boxplot
+
+def length_stats_by_category():
+    """Quartiles, 1.5×IQR whiskers and outliers per category, vectorized! 📐"""
+    lengths = df['content_length']
+    groups = df['MainCategoryClean']
+    stats = lengths.groupby(groups, observed=True).quantile([0.25, 0.5, 0.75]).unstack()
+    
+    # Fences from the quartiles, broadcast back to every row in one lookup
+    iqr = stats[0.75] - stats[0.25]
+    low = (stats[0.25] - BOX_WHISKER_IQR * iqr).reindex(groups).to_numpy()
+    high = (stats[0.75] + BOX_WHISKER_IQR * iqr).reindex(groups).to_numpy()
+    inside = (lengths.to_numpy() >= low) & (lengths.to_numpy() <= high)
+    
+    # Whiskers end at the furthest real lengths within the fences
+    within = lengths[inside].groupby(groups[inside], observed=True)
+    stats['whislo'] = within.min()
+    stats['whishi'] = within.max()
+    return stats, lengths[~inside].groupby(groups[~inside], observed=True).agg(list)
+
 def plot_length_by_category():
     """Create box plot of length by category! 📦"""
-    if 'MainCategory' not in df.columns or 'content_length' not in df.columns:
+    if 'MainCategory' not in COLS or 'content_length' not in COLS:
         safe_print("❌ Missing required columns!")
         return
     
+    # Boxes from per-category stats; only the outliers are sent as points
+    stats, outliers = length_stats_by_category()
+    
     if PLOTLY_AVAILABLE:
-        fig = px.box(
-            df,
-            x='MainCategory',
-            y='content_length',
-            title="📦 Content Length by Category"
-        )
+        import plotly.graph_objects as go
+        fig = go.Figure(go.Box(
+            x=stats.index,
+            lowerfence=stats['whislo'],
+            q1=stats[0.25],
+            median=stats[0.5],
+            q3=stats[0.75],
+            upperfence=stats['whishi'],
+            name="content_length"
+        ))
+        if len(outliers):
+            fig.add_trace(go.Scatter(
+                x=outliers.index.repeat(outliers.str.len()),
+                y=np.concatenate(outliers.to_list()),
+                mode='markers',
+                name="outliers"
+            ))
+        fig.update_layout(title="📦 Content Length by Category", showlegend=False)
         fig.update_xaxes(tickangle=45)
-        fig.show()
+        show_figure(fig, "length_by_category.png")
     else:
-        plt.figure(figsize=(12, 6))
-        df.boxplot(column='content_length', by='MainCategory', rot=45)
-        plt.title('Content Length by Category')
+        box_stats = [
+            {
+                'label': cat,
+                'whislo': row['whislo'],
+                'q1': row[0.25],
+                'med': row[0.5],
+                'q3': row[0.75],
+                'whishi': row['whishi'],
+                'fliers': outliers.get(cat, [])
+            }
+            for cat, row in stats.iterrows()
+        ]
+        plt = get_pyplot()
+        fig, ax = plt.subplots(figsize=(12, 6))
+        ax.bxp(box_stats)
+        ax.tick_params(axis='x', rotation=45)
+        ax.set_title('Content Length by Category')
         plt.tight_layout()
         plt.savefig(os.path.join(OUTPUT_FOLDER, "length_by_category.png"))
         plt.show()
@@ -285,15 +461,17 @@ def print_summary():
     
     safe_print(f"\n📦 Total Shortcuts: {len(df)}")
     
-    if 'content_length' in df.columns:
+    if 'content_length' in COLS:
+        lengths = df['content_length'].to_numpy()
+        stats = length_stats(lengths)
         safe_print(f"\n📏 Content Length Stats:")
-        safe_print(f"   Shortest: {df['content_length'].min()} chars")
-        safe_print(f"   Longest: {df['content_length'].max()} chars")
-        safe_print(f"   Average: {df['content_length'].mean():.1f} chars")
+        safe_print(f"   Shortest: {stats['min']} chars")
+        safe_print(f"   Longest: {stats['max']} chars")
+        safe_print(f"   Average: {stats['mean']:.1f} chars")
     
-    if 'MainCategory' in df.columns:
+    if 'MainCategory' in COLS:
         safe_print(f"\n🏷️ Top Categories:")
-        for cat, count in df['MainCategory'].value_counts().head(5).items():
+        for cat, count in CAT_COUNTS.head(5).items():
             safe_print(f"   {cat}: {count}")
 
 print_summary()
@@ -55,7 +55,7 @@ if tools_dir not in sys.path:
 
 # Try to import our compatibility module
 try:
-    from colab_compat import ColabCompat, setup_environment, safe_print
+    from colab_compat import ColabCompat, setup_environment, safe_print, fetch_modified_time
 except ImportError:
     # If running standalone, define minimal compatibility
     safe_print("⚠️ colab_compat.py not found - using standalone mode")
@@ -80,22 +80,24 @@ compat.print_environment()
 # %%
 # Install/verify packages
 import subprocess
+import importlib.util
 
 def ensure_packages():
     """Ensure required packages are installed! 📦"""
-    required = ['gspread', 'gspread-dataframe', 'pandas']
+    required = ['gspread', 'pandas', 'orjson', 'xxhash']
     
-    for pkg in required:
-        try:
-            __import__(pkg.replace('-', '_'))
-        except ImportError:
-            safe_print(f"📦 Installing {pkg}...")
-            if compat.in_colab:
-                from IPython import get_ipython
-                get_ipython().system(f'pip install {pkg} -q')
-            else:
-                subprocess.run([sys.executable, '-m', 'pip', 'install', pkg, '-q'], 
-                             capture_output=True)
+    # find_spec only locates the package; nothing is imported or initialized
+    missing = [pkg for pkg in required if importlib.util.find_spec(pkg.replace('-', '_')) is None]
+    if missing:
+        # One pip call for everything missing instead of one per package
+        safe_print(f"📦 Installing {', '.join(missing)}...")
+        if compat.in_colab:
+            from IPython import get_ipython
+            get_ipython().system(f'pip install {" ".join(missing)} -q')
+        else:
+            subprocess.run([sys.executable, '-m', 'pip', 'install', *missing, '-q'], 
+                         capture_output=True)
+        importlib.invalidate_caches()
     safe_print("✅ All packages ready!")
 
 ensure_packages()
@@ -104,17 +106,56 @@ ensure_packages()
 # Now import everything we need
 import gspread
 import pandas as pd
+import numpy as np
+import base64
+import gzip
 import json
+import csv
+import heapq
+import re
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime, timedelta
 from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+# orjson (Rust) is much faster for big backup files; stdlib json is the fallback
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 try:
-    from gspread_dataframe import set_with_dataframe, get_as_dataframe
+    import xxhash
+    XXHASH_AVAILABLE = True
 except ImportError:
-    set_with_dataframe = None
+    XXHASH_AVAILABLE = False
+
+def dump_json_bytes(obj):
+    """Serialize to compact UTF-8 JSON bytes (orjson when available)! ⚡"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def load_json_file(filepath):
+    """Read and parse a JSON file in one go (orjson when available)! ⚡"""
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+    if raw[:2] == b'\x1f\x8b':  # gzip magic number
+        raw = gzip.decompress(raw)
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+@lru_cache(maxsize=8)
+def load_backup_cached(filepath, mtime_ns):
+    """Parsed backup keyed on path + mtime (a rewritten file misses)! 🗃️"""
+    return load_json_file(filepath)
+
+def load_backup(filepath):
+    """Load a backup, reusing recent parses (treat the result as read-only)! ♻️"""
+    return load_backup_cached(filepath, os.stat(filepath).st_mtime_ns)
 
 safe_print("✅ Libraries imported! Ready to protect your data! 🛡️")
 
@@ -189,11 +230,32 @@ SHEET_NAME = "Shortcuts"
 # Backup settings
 MAX_BACKUPS_TO_KEEP = 30
 BACKUP_PREFIX = "TE_Backup"
+BACKUP_EXTENSION = ".json.gz"
+# Older, uncompressed backups are still listed, verified and restorable
+BACKUP_EXTENSIONS = (BACKUP_EXTENSION, ".json")
+GZIP_LEVEL = 1  # fastest level; only slightly larger than 6-9 on text
+
+# Tiny sidecar next to each backup so listings never open the backup itself
+META_EXTENSION = ".meta.json"
+SIDECAR_FIELDS = ('backup_date', 'row_count', 'version', 'backup_type',
+                  'base_backup', 'checksum', 'checksum_algorithm')
+WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB: few large writes through the Drive mount
+
+# Delta backups store only rows that differ from the latest full backup
+DELTA_SUFFIX = "_delta"
+DELTA_CHAIN_LIMIT = 10        # force a full backup after this many deltas
+DELTA_MAX_CHANGED_RATIO = 0.3 # ...or when this share of rows changed
+
+# TE_Backup_YYYYmmdd_HHMMSS[_delta].json[.gz], compiled once
+BACKUP_NAME_RE = re.compile(
+    rf"^{re.escape(BACKUP_PREFIX)}_(\d{{4}})(\d{{2}})(\d{{2}})_(\d{{2}})(\d{{2}})(\d{{2}})"
+)
 
-# Connect to spreadsheet
+# Connect to spreadsheet once; every backup/restore call reuses this handle
+# (and the client's keep-alive session). All reads/writes address the sheet
+# by A1 range, so no separate worksheet lookup RPC is needed
 try:
     spreadsheet = gc.open_by_key(SPREADSHEET_ID)
-    worksheet = spreadsheet.worksheet(SHEET_NAME)
     safe_print(f"✅ Connected to '{spreadsheet.title}' - Sheet: '{SHEET_NAME}' 🔗")
 except Exception as e:
     safe_print(f"❌ Connection error: {e}")
@@ -204,29 +266,73 @@ except Exception as e:
 # ## Step 4: 📊 Backup Status Dashboard
 
 # %%
+def scan_backups():
+    """List backup files with ONE directory pass (stat cached per entry)! 📂"""
+    if not os.path.exists(BACKUP_FOLDER):
+        return []
+    with os.scandir(BACKUP_FOLDER) as entries:
+        return [
+            (entry.name, entry.stat(), entry.path)
+            for entry in entries
+            if entry.name.startswith(BACKUP_PREFIX)
+            and entry.name.endswith(BACKUP_EXTENSIONS)
+            and not entry.name.endswith(META_EXTENSION)
+            and entry.is_file()
+        ]
+
+def backup_stem(filepath):
+    """Strip the backup extension (.json.gz or .json) from a path! ✂️"""
+    for ext in BACKUP_EXTENSIONS:
+        if filepath.endswith(ext):
+            return filepath[:-len(ext)]
+    return filepath
+
+def is_delta_backup(filepath):
+    """True for delta backups (named ..._delta.json.gz)! 🧩"""
+    return backup_stem(filepath).endswith(DELTA_SUFFIX)
+
+def meta_sidecar_path(filepath):
+    """Path of the small metadata sidecar saved alongside a backup! 🏷️"""
+    return backup_stem(filepath) + META_EXTENSION
+
+def load_backup_metadata(filepath):
+    """Backup metadata from the sidecar, or the full file for old backups! 🏷️"""
+    sidecar = meta_sidecar_path(filepath)
+    if os.path.exists(sidecar):
+        return load_json_file(sidecar)
+    return load_backup(filepath)['metadata']
+
+def csv_twin_path(filepath):
+    """Path of the CSV saved alongside a backup! 📊"""
+    return backup_stem(filepath) + '.csv'
+
+def parse_backup_date(filename):
+    """Read the YYYYmmdd_HHMMSS stamp out of a backup filename (or None)! 📅"""
+    match = BACKUP_NAME_RE.match(filename)
+    if not match:
+        return None
+    try:
+        # Integer slicing is much cheaper than strptime's format parser
+        return datetime(*map(int, match.groups()))
+    except ValueError:
+        return None
+
 def get_backup_status():
     """Check existing backups and return status dashboard! 📊"""
     
     backups = []
-    if os.path.exists(BACKUP_FOLDER):
-        for f in os.listdir(BACKUP_FOLDER):
-            if f.startswith(BACKUP_PREFIX) and f.endswith('.json'):
-                filepath = os.path.join(BACKUP_FOLDER, f)
-                stat = os.stat(filepath)
-                
-                try:
-                    timestamp_str = f.replace(f"{BACKUP_PREFIX}_", "").replace(".json", "")
-                    backup_date = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
-                except ValueError:
-                    # Fallback to file modification time if timestamp parsing fails
-                    backup_date = datetime.fromtimestamp(stat.st_mtime)
-                
-                backups.append({
-                    'filename': f,
-                    'date': backup_date,
-                    'size_kb': round(stat.st_size / 1024, 2),
-                    'filepath': filepath
-                })
+    for f, stat, filepath in scan_backups():
+        backup_date = parse_backup_date(f)
+        if backup_date is None:
+            # Fallback to file modification time if timestamp parsing fails
+            backup_date = datetime.fromtimestamp(stat.st_mtime)
+        
+        backups.append({
+            'filename': f,
+            'date': backup_date,
+            'size_kb': round(stat.st_size / 1024, 2),
+            'filepath': filepath
+        })
     
     backups.sort(key=lambda x: x['date'], reverse=True)
     
@@ -264,14 +370,208 @@ existing_backups = get_backup_status()
 # ## Step 5: 💾 Create Full Backup
 
 # %%
-def calculate_checksum(data):
-    """Calculate MD5 checksum for data integrity! 🔐"""
+def split_table(values):
+    """Split raw sheet values into (headers, padded rows)! ✂️"""
+    if not values:
+        return [], []
+    headers = values[0]
+    width = len(headers)
+    # The API trims trailing blank cells, so pad every row back to full width
+    rows = [row[:width] + [''] * (width - len(row)) for row in values[1:]]
+    return headers, rows
+
+def fetch_sheet_tables(sheet_names):
+    """Fetch several sheets' headers + rows in ONE batchGet call! 📥"""
+    response = spreadsheet.values_batch_get(
+        [f"'{name}'" for name in sheet_names],
+        params={
+            'valueRenderOption': 'UNFORMATTED_VALUE',
+            'dateTimeRenderOption': 'SERIAL_NUMBER'
+        }
+    )
+    # valueRanges come back in the same order as the requested ranges
+    return {
+        name: split_table(value_range.get('values', []))
+        for name, value_range in zip(sheet_names, response.get('valueRanges', []))
+    }
+
+def fetch_sheet_values():
+    """Fetch headers + rows of the Shortcuts sheet in one API call! 📥"""
+    return fetch_sheet_tables([SHEET_NAME]).get(SHEET_NAME, ([], []))
+
+def rows_to_records(headers, rows):
+    """Build get_all_records()-style dicts from header + row lists! 📋"""
+    return [dict(zip(headers, row)) for row in rows]
+
+def table_payload(headers, rows):
+    """Backup v3 payload: headers stored once, rows as plain lists! 📦"""
+    return {'headers': headers, 'rows': rows}
+
+def backup_table(backup):
+    """Return (headers, rows) from a backup of any version! 📂"""
+    data = backup['data']
+    if backup['metadata'].get('backup_type') == 'delta':
+        return apply_delta(backup)
+    if isinstance(data, list):
+        # v2 backups stored one dict per row
+        headers = backup['metadata']['headers']
+        return headers, [[record.get(h, '') for h in headers] for record in data]
+    return data['headers'], data['rows']
+
+# Digest used for new backups; v2 backups record none (MD5 of the row dicts).
+# "rows-*" digests stream one compact stdlib-JSON line per row into the hasher
+CHECKSUM_ALGORITHM = 'rows-xxh3' if XXHASH_AVAILABLE else 'rows-blake2b'
+CHECKSUM_HASHERS = {
+    'rows-blake2b': lambda: hashlib.blake2b(digest_size=16),
+    'rows-xxh3': lambda: xxhash.xxh3_128(),
+}
+CHECKSUM_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+def calculate_checksum(data, algorithm='md5'):
+    """Calculate checksum for data integrity! 🔐"""
     if isinstance(data, str):
         return hashlib.md5(data.encode()).hexdigest()
-    return hashlib.md5(json.dumps(data, sort_keys=True).encode()).hexdigest()
+    if algorithm == 'md5':
+        # v2 list-of-dicts: key order varies, so keys must be sorted
+        return hashlib.md5(json.dumps(data, sort_keys=True).encode()).hexdigest()
+    # Our own serialization, not pandas' row hashes: stable across library
+    # versions and type-aware (1, "1" and True all encode differently)
+    hasher = CHECKSUM_HASHERS[algorithm]()
+    hasher.update(CHECKSUM_ENCODER.encode(data['headers']).encode())
+    for row in data['rows']:
+        hasher.update(b'\n')
+        hasher.update(CHECKSUM_ENCODER.encode(row).encode())
+    return hasher.hexdigest()
 
-def create_backup(include_csv=True):
-    """Create a complete backup of the spreadsheet! 💾"""
+def row_hashes(headers, rows):
+    """One 64-bit hash per row, computed vectorized by pandas! #️⃣"""
+    # Type-blind (values are stringified), so only for finding candidates
+    if not rows:
+        return np.empty(0, dtype='<u8')
+    frame = pd.DataFrame(rows, columns=headers, dtype=object)
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy(dtype='<u8')
+
+def encode_row_hashes(hashes):
+    """Pack row hashes into a compact base64 string for the metadata! 📦"""
+    return base64.b64encode(hashes.astype('<u8').tobytes()).decode('ascii')
+
+def decode_row_hashes(encoded):
+    """Unpack row hashes stored by encode_row_hashes()! 📂"""
+    return np.frombuffer(base64.b64decode(encoded), dtype='<u8')
+
+def build_delta(rows, hashes, base_rows, base_hashes):
+    """Encode rows as references into a base backup plus the new rows! 🧩"""
+    base_index = {}
+    for i, h in enumerate(base_hashes.tolist()):
+        base_index.setdefault(h, i)
+    
+    layout, new_rows = [], []
+    for row, h in zip(rows, hashes.tolist()):
+        i = base_index.get(h)
+        # Hashes only pick the candidate; equality keeps the delta lossless
+        if i is not None and base_rows[i] == row:
+            layout.append(i)
+        else:
+            new_rows.append(row)
+            layout.append(-len(new_rows))
+    return {'layout': layout, 'rows': new_rows}
+
+def apply_delta(backup):
+    """Rebuild (headers, rows) of a delta backup from its base! 🔧"""
+    meta = backup['metadata']
+    base = load_backup(os.path.join(BACKUP_FOLDER, meta['base_backup']))
+    _, base_rows = backup_table(base)
+    new_rows = backup['data']['rows']
+    # layout: >= 0 is a base row index, -k is the k-th stored row
+    rows = [base_rows[i] if i >= 0 else new_rows[-i - 1] for i in backup['data']['layout']]
+    return backup['data']['headers'], rows
+
+def checksum_payload(backup):
+    """The data a backup's checksum covers (deltas: the rebuilt table)! 🔐"""
+    if backup['metadata'].get('backup_type') == 'delta':
+        return table_payload(*apply_delta(backup))
+    return backup['data']
+
+def choose_delta_base(headers, rows, hashes):
+    """Pick the latest full backup to diff against, or None for a full! 🎯"""
+    names = sorted(f for f, _, _ in scan_backups())
+    full_names = [f for f in names if not is_delta_backup(f)]
+    if not full_names:
+        return None
+    base_name = full_names[-1]
+    deltas_since = sum(1 for f in names if f > base_name and is_delta_backup(f))
+    if deltas_since >= DELTA_CHAIN_LIMIT:
+        return None
+    
+    base = load_backup(os.path.join(BACKUP_FOLDER, base_name))
+    base_headers, base_rows = backup_table(base)
+    if base_headers != headers:
+        return None
+    if 'row_hashes' in base['metadata']:
+        base_hashes = decode_row_hashes(base['metadata']['row_hashes'])
+    else:
+        base_hashes = row_hashes(base_headers, base_rows)
+    
+    delta = build_delta(rows, hashes, base_rows, base_hashes)
+    if len(delta['rows']) > DELTA_MAX_CHANGED_RATIO * max(len(rows), 1):
+        return None
+    return base_name, delta
+
+def find_identical_backup(checksum):
+    """Name of the latest backup if it already holds this exact data! ♻️"""
+    names = [f for f, _, _ in scan_backups()]
+    if not names:
+        return None
+    latest = max(names)
+    # The sidecar is a few hundred bytes, so this never loads the backup itself;
+    # rows-* checksums are type-aware, so 1 -> "1" is never mistaken for no-op
+    metadata = load_backup_metadata(os.path.join(BACKUP_FOLDER, latest))
+    if metadata.get('checksum_algorithm', 'md5') != CHECKSUM_ALGORITHM:
+        return None
+    return latest if metadata.get('checksum') == checksum else None
+
+def backup_checksum_algorithm(backup):
+    """Which digest a backup's checksum was made with! 🔑"""
+    return backup['metadata'].get('checksum_algorithm', 'md5')
+
+def file_digest(payload):
+    """BLAKE2b digest of raw file bytes (no JSON parsing)! 🔑"""
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+def write_json_backup(filepath, backup_obj):
+    """Write the gzipped JSON backup; returns (size in KB, byte digest)! 💾"""
+    # Shortcut text compresses several-fold, so far fewer bytes hit Drive
+    payload = gzip.compress(dump_json_bytes(backup_obj), compresslevel=GZIP_LEVEL)
+    with open(filepath, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    # Sidecar written last: if it exists, the backup it describes is complete
+    metadata = backup_obj['metadata']
+    with open(meta_sidecar_path(filepath), 'wb') as f:
+        f.write(dump_json_bytes({k: metadata[k] for k in SIDECAR_FIELDS if k in metadata}))
+    return len(payload) / 1024, file_digest(payload)
+
+def verify_written_file(filepath, expected_digest):
+    """Re-read a just-written file in chunks and compare byte digests! 🔍"""
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest() == expected_digest
+
+def write_csv_backup(filepath, headers, rows):
+    """Write the human-readable CSV copy; returns its size in KB! 📊"""
+    # Rows are already lists, so stream them straight out (no DataFrame);
+    # the large buffer turns per-row writes into a few bulk FUSE transfers
+    with open(filepath, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        writer.writerows(rows)
+    return os.path.getsize(filepath) / 1024
+
+def create_backup(include_csv=True, full=False, verify=False, force=False, rotate=True):
+    """Create a backup of the spreadsheet (a small delta when possible)! 💾"""
     
     safe_print("\n" + "=" * 60)
     safe_print("💾 CREATING BACKUP")
@@ -279,14 +579,29 @@ def create_backup(include_csv=True):
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
-    # Fetch data
+    # Fetch data (modified time first, so a concurrent edit is never masked)
     safe_print("\n📥 Step 1: Fetching data from spreadsheet...")
-    data = worksheet.get_all_records()
-    headers = worksheet.row_values(1)
-    safe_print(f"   ✅ Fetched {len(data)} rows with {len(headers)} columns")
+    modified_time = fetch_modified_time(spreadsheet)
+    headers, rows = fetch_sheet_values()
+    safe_print(f"   ✅ Fetched {len(rows)} rows with {len(headers)} columns")
+    
+    # Calculate checksum (always over the full table, so deltas verify too)
+    safe_print("\n🔐 Step 2: Calculating data checksum...")
+    hashes = row_hashes(headers, rows)
+    checksum = calculate_checksum(table_payload(headers, rows), CHECKSUM_ALGORITHM)
+    safe_print(f"   ✅ Checksum: {checksum[:16]}...")
+    
+    # Skip the write entirely when nothing changed since the latest backup
+    if not force:
+        identical = find_identical_backup(checksum)
+        if identical:
+            safe_print(f"\n♻️ No changes since {identical} - nothing to write!")
+            safe_print("💡 Use create_backup(force=True) to save a copy anyway")
+            return os.path.join(BACKUP_FOLDER, identical)
     
     # Create backup object
-    safe_print("\n📦 Step 2: Preparing backup package...")
+    safe_print("\n📦 Step 3: Preparing backup package...")
+    delta_base = None if full else choose_delta_base(headers, rows, hashes)
     backup_obj = {
         'metadata': {
             'backup_timestamp': timestamp,
@@ -294,58 +609,67 @@ def create_backup(include_csv=True):
             'spreadsheet_id': SPREADSHEET_ID,
             'spreadsheet_name': spreadsheet.title,
             'sheet_name': SHEET_NAME,
-            'row_count': len(data),
+            'row_count': len(rows),
             'column_count': len(headers),
             'headers': headers,
-            'version': '2.0',
+            'version': '3.1',
             'environment': 'colab' if compat.in_colab else 'local',
-            'checksum': None
+            'checksum': checksum,
+            'checksum_algorithm': CHECKSUM_ALGORITHM,
+            'row_hashes': encode_row_hashes(hashes),
+            'sheet_modified_time': modified_time,
+            'backup_type': 'full'
         },
-        'data': data
+        'data': table_payload(headers, rows)
     }
+    if delta_base:
+        base_name, delta = delta_base
+        backup_obj['metadata'].update({'backup_type': 'delta', 'base_backup': base_name})
+        backup_obj['data'] = {'headers': headers, **delta}
+        safe_print(f"   🧩 Delta vs {base_name}: {len(delta['rows'])} new/edited rows stored")
     
-    # Calculate checksum
-    safe_print("\n🔐 Step 3: Calculating data checksum...")
-    backup_obj['metadata']['checksum'] = calculate_checksum(data)
-    safe_print(f"   ✅ Checksum: {backup_obj['metadata']['checksum'][:16]}...")
-    
-    # Save JSON
-    safe_print("\n💾 Step 4: Saving JSON backup...")
-    json_filename = f"{BACKUP_PREFIX}_{timestamp}.json"
+    suffix = DELTA_SUFFIX if delta_base else ""
+    json_filename = f"{BACKUP_PREFIX}_{timestamp}{suffix}{BACKUP_EXTENSION}"
     json_filepath = os.path.join(BACKUP_FOLDER, json_filename)
+    # Same stem as the JSON (including any delta suffix) so rotation/download find it
+    csv_filepath = csv_twin_path(json_filepath)
+    csv_filename = os.path.basename(csv_filepath)
     
-    with open(json_filepath, 'w', encoding='utf-8') as f:
-        json.dump(backup_obj, f, ensure_ascii=False, indent=2)
-    
-    json_size = os.path.getsize(json_filepath) / 1024
-    safe_print(f"   ✅ Saved: {json_filename} ({json_size:.2f} KB)")
-    
-    # Save CSV
-    if include_csv:
-        safe_print("\n📊 Step 5: Saving CSV backup...")
-        csv_filename = f"{BACKUP_PREFIX}_{timestamp}.csv"
-        csv_filepath = os.path.join(BACKUP_FOLDER, csv_filename)
+    # The JSON and CSV files are independent, so write them concurrently
+    # (threads, not asyncio: Colab/Jupyter already run an event loop)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        json_future = executor.submit(write_json_backup, json_filepath, backup_obj)
+        csv_future = executor.submit(write_csv_backup, csv_filepath, headers, rows) if include_csv else None
         
-        df = pd.DataFrame(data)
-        df.to_csv(csv_filepath, index=False, encoding='utf-8')
+        safe_print("\n💾 Step 4: Saving JSON backup...")
+        json_size, json_digest = json_future.result()
+        safe_print(f"   ✅ Saved: {json_filename} ({json_size:.2f} KB)")
         
-        csv_size = os.path.getsize(csv_filepath) / 1024
-        safe_print(f"   ✅ Saved: {csv_filename} ({csv_size:.2f} KB)")
+        if csv_future:
+            safe_print("\n📊 Step 5: Saving CSV backup...")
+            csv_size = csv_future.result()
+            safe_print(f"   ✅ Saved: {csv_filename} ({csv_size:.2f} KB)")
     
     # Cleanup old backups
-    safe_print("\n🧹 Step 6: Managing backup rotation...")
-    cleanup_old_backups()
+    if rotate:
+        safe_print("\n🧹 Step 6: Managing backup rotation...")
+        cleanup_old_backups()
     
-    # Verify
-    safe_print("\n✅ Step 7: Verifying backup...")
-    verify_backup(json_filepath)
+    # Verify: the bytes were hashed in memory and fsync'd, so reading the
+    # whole file back is opt-in (restore_from_backup still runs verify_backup)
+    if verify:
+        safe_print("\n✅ Step 7: Verifying backup...")
+        if verify_written_file(json_filepath, json_digest):
+            safe_print("   ✅ Written bytes verified! 🔐")
+        else:
+            safe_print("   ❌ INTEGRITY ERROR! File differs from what was written! ⚠️")
     
     safe_print("\n" + "=" * 60)
     safe_print("🎉 BACKUP COMPLETE!")
     safe_print("=" * 60)
     safe_print(f"\n📁 Location: {BACKUP_FOLDER}")
     safe_print(f"📄 Filename: {json_filename}")
-    safe_print(f"📊 Rows: {len(data)}")
+    safe_print(f"📊 Rows: {len(rows)}")
     safe_print(f"💾 Size: {json_size:.2f} KB")
     
     return json_filepath
@@ -357,72 +681,145 @@ def create_backup(include_csv=True):
 def verify_backup(filepath):
     """Verify backup file integrity! 🔐"""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            backup = json.load(f)
+        backup = load_backup(filepath)
         
         assert 'metadata' in backup, "Missing metadata!"
         assert 'data' in backup, "Missing data!"
         assert 'checksum' in backup['metadata'], "Missing checksum!"
         
         expected = backup['metadata']['checksum']
-        actual = calculate_checksum(backup['data'])
+        actual = calculate_checksum(checksum_payload(backup), backup_checksum_algorithm(backup))
         
         if expected == actual:
-            safe_print(f"   ✅ Integrity verified! Checksum matches! 🔐")
+            safe_print("   ✅ Integrity verified! Checksum matches! 🔐")
             return True
         else:
-            safe_print(f"   ❌ INTEGRITY ERROR! Checksum mismatch! ⚠️")
+            safe_print("   ❌ INTEGRITY ERROR! Checksum mismatch! ⚠️")
             return False
     except Exception as e:
         safe_print(f"   ❌ Verification failed: {e}")
         return False
 
+def verify_all_backups():
+    """Verify every backup in the folder concurrently! 🔐"""
+    filepaths = sorted((filepath for _, _, filepath in scan_backups()), reverse=True)
+    if not filepaths:
+        safe_print("⚠️ No backups found!")
+        return {}
+    
+    safe_print(f"🔐 Verifying {len(filepaths)} backups...")
+    # Each check is independent file I/O + hashing; Drive latency dominates
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = dict(zip(filepaths, executor.map(verify_backup, filepaths)))
+    
+    failed = [os.path.basename(p) for p, ok in results.items() if not ok]
+    if failed:
+        safe_print(f"❌ {len(failed)} backup(s) failed verification:")
+        for name in failed:
+            safe_print(f"   ⚠️ {name}")
+    else:
+        safe_print(f"✅ All {len(results)} backups verified! 🔐")
+    return results
+
 # %% [markdown]
 # ## Step 7: 🧹 Backup Rotation
 
 # %%
+def remove_backup_files(backup):
+    """Delete one backup's JSON (plus CSV/sidecar); returns the error, if any! 🗑️"""
+    try:
+        os.remove(backup['filepath'])
+        for twin_path in (csv_twin_path(backup['filepath']), meta_sidecar_path(backup['filepath'])):
+            if os.path.exists(twin_path):
+                os.remove(twin_path)
+    except OSError as e:
+        return e
+    return None
+
+def delta_chain_bases(filepaths):
+    """Names of every backup the given deltas rebuild from (transitively)! 🔗"""
+    needed = set()
+    pending = [p for p in filepaths if is_delta_backup(p)]
+    while pending:
+        base = load_backup_metadata(pending.pop()).get('base_backup')
+        if base and base not in needed:
+            needed.add(base)
+            if is_delta_backup(base):
+                pending.append(os.path.join(BACKUP_FOLDER, base))
+    return needed
+
 def cleanup_old_backups():
     """Remove old backups to maintain rotation! 🧹"""
     if not os.path.exists(BACKUP_FOLDER):
         safe_print("   ⚠️ Backup folder doesn't exist yet")
         return
     
-    backups = []
     try:
-        for f in os.listdir(BACKUP_FOLDER):
-            if f.startswith(BACKUP_PREFIX) and f.endswith('.json'):
-                filepath = os.path.join(BACKUP_FOLDER, f)
-                try:
-                    stat = os.stat(filepath)
-                    backups.append({'filename': f, 'mtime': stat.st_mtime, 'filepath': filepath})
-                except OSError as e:
-                    safe_print(f"   ⚠️ Could not stat {f}: {e}")
+        backups = [
+            {'filename': f, 'mtime': stat.st_mtime, 'filepath': filepath}
+            for f, stat, filepath in scan_backups()
+        ]
     except OSError as e:
         safe_print(f"   ❌ Error reading backup folder: {e}")
         return
     
-    backups.sort(key=lambda x: x['mtime'])
+    # Only the oldest few matter: partial selection instead of a full sort
+    excess = len(backups) - MAX_BACKUPS_TO_KEEP
+    expired = heapq.nsmallest(excess, backups, key=lambda x: x['mtime']) if excess > 0 else []
     
-    while len(backups) > MAX_BACKUPS_TO_KEEP:
-        oldest = backups.pop(0)
+    # Kept deltas still need their whole base chain, whatever the mtimes say
+    if expired:
+        expired_names = {b['filename'] for b in expired}
+        kept = [b['filepath'] for b in backups if b['filename'] not in expired_names]
         try:
-            os.remove(oldest['filepath'])
-            csv_path = oldest['filepath'].replace('.json', '.csv')
-            if os.path.exists(csv_path):
-                os.remove(csv_path)
-            safe_print(f"   🗑️ Removed: {oldest['filename']}")
-        except OSError as e:
-            safe_print(f"   ⚠️ Could not remove {oldest['filename']}: {e}")
-    
-    # Count only backup files with proper prefix
-    remaining = len([f for f in os.listdir(BACKUP_FOLDER) 
-                    if f.endswith('.json') and f.startswith(BACKUP_PREFIX)])
-    safe_print(f"   ✅ Keeping {remaining} backups")
+            needed = delta_chain_bases(kept)
+        except (OSError, ValueError) as e:
+            safe_print(f"   ❌ Could not read delta metadata, skipping rotation: {e}")
+            return
+        expired = [b for b in expired if b['filename'] not in needed]
+    
+    # Unlinks on a Drive mount are slow network calls; run them concurrently
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        errors = list(executor.map(remove_backup_files, expired))
+    
+    failed = 0
+    for backup, error in zip(expired, errors):
+        if error:
+            safe_print(f"   ⚠️ Could not remove {backup['filename']}: {error}")
+            failed += 1
+        else:
+            safe_print(f"   🗑️ Removed: {backup['filename']}")
+    
+    safe_print(f"   ✅ Keeping {len(backups) - len(expired) + failed} backups")
 
 # %% [markdown]
 # ## Step 8: 🔄 Detect Changes
 
 # %%
+def report_row_changes(metadata, headers, rows, max_listed=10):
+    """Show which rows were added/removed using per-row hash sets! 🔍"""
+    if 'row_hashes' not in metadata:
+        return
+    if metadata.get('headers') != headers:
+        safe_print("   🏷️ Column headers changed")
+        return
+    
+    old_hashes = decode_row_hashes(metadata['row_hashes'])
+    new_hashes = row_hashes(headers, rows)
+    # O(N) membership tests on 64-bit ints instead of comparing rows in Python
+    added = np.flatnonzero(~np.isin(new_hashes, old_hashes))
+    removed = np.flatnonzero(~np.isin(old_hashes, new_hashes))
+    
+    safe_print(f"   ➕ New/edited rows: {len(added)}")
+    safe_print(f"   ➖ Removed/replaced rows: {len(removed)}")
+    if len(added):
+        # +2: one for the header row, one for 1-based sheet numbering
+        listed = ', '.join(str(i + 2) for i in added[:max_listed])
+        more = f" (+{len(added) - max_listed} more)" if len(added) > max_listed else ""
+        safe_print(f"   📍 Sheet rows: {listed}{more}")
+    if not len(added) and not len(removed):
+        safe_print("   🔀 Same rows, different order or cell types")
+
 def detect_changes():
     """Detect what changed since the last backup! 🔄"""
     safe_print("\n" + "=" * 60)
@@ -434,18 +831,29 @@ def detect_changes():
         safe_print("\n⚠️ No previous backups found!")
         return None
     
-    with open(backups[0]['filepath'], 'r', encoding='utf-8') as f:
-        backup_data = json.load(f)
+    backup_data = load_backup(backups[0]['filepath'])
+    
+    # Cheap pre-check: if Drive reports no edit since the backup, skip the fetch
+    backed_up_time = backup_data['metadata'].get('sheet_modified_time')
+    if backed_up_time and fetch_modified_time(spreadsheet) == backed_up_time:
+        safe_print(f"\n✅ Sheet not modified since last backup ({backed_up_time})! 🎉")
+        return False
     
     old_checksum = backup_data['metadata']['checksum']
-    current_data = worksheet.get_all_records()
-    new_checksum = calculate_checksum(current_data)
+    headers, rows = fetch_sheet_values()
+    # Hash the current sheet in the same layout as the backup being compared
+    if isinstance(backup_data['data'], list):
+        current_data = rows_to_records(headers, rows)
+    else:
+        current_data = table_payload(headers, rows)
+    new_checksum = calculate_checksum(current_data, backup_checksum_algorithm(backup_data))
     
     safe_print(f"\n📊 Backup rows: {backup_data['metadata']['row_count']}")
-    safe_print(f"📊 Current rows: {len(current_data)}")
+    safe_print(f"📊 Current rows: {len(rows)}")
     
     if old_checksum != new_checksum:
         safe_print(f"\n⚠️ CHANGES DETECTED!")
+        report_row_changes(backup_data['metadata'], headers, rows)
         safe_print(f"💡 Run create_backup() to save changes!")
         return True
     else:
@@ -465,20 +873,17 @@ def list_available_backups():
         return backups
     
     try:
-        for f in os.listdir(BACKUP_FOLDER):
-            if f.startswith(BACKUP_PREFIX) and f.endswith('.json'):
-                filepath = os.path.join(BACKUP_FOLDER, f)
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as file:
-                        backup = json.load(file)
-                    backups.append({
-                        'filename': f,
-                        'filepath': filepath,
-                        'date': backup['metadata'].get('backup_date', 'Unknown'),
-                        'rows': backup['metadata'].get('row_count', 0)
-                    })
-                except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
-                    safe_print(f"   ⚠️ Skipping corrupted backup {f}: {e}")
+        for f, _, filepath in scan_backups():
+            try:
+                metadata = load_backup_metadata(filepath)
+                backups.append({
+                    'filename': f,
+                    'filepath': filepath,
+                    'date': metadata.get('backup_date', 'Unknown'),
+                    'rows': metadata.get('row_count', 0)
+                })
+            except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
+                safe_print(f"   ⚠️ Skipping corrupted backup {f}: {e}")
     except OSError as e:
         safe_print(f"❌ Error reading backup folder: {e}")
         return backups
@@ -514,10 +919,13 @@ def restore_from_backup(backup_number=None, create_safety_backup=True):
     if not verify_backup(backup_filepath):
         safe_print("❌ Integrity check failed!")
         return False
+    # Reuses the parse from verify_backup (cached)
+    backup = load_backup(backup_filepath)
     
     if create_safety_backup:
         safe_print("\n💾 Creating safety backup first...")
-        create_backup(include_csv=False)
+        # No rotation here: it could delete the very backup being restored
+        create_backup(include_csv=False, rotate=False)
     
     safe_print("\n⚠️ This will OVERWRITE your spreadsheet!")
     try:
@@ -530,22 +938,18 @@ def restore_from_backup(backup_number=None, create_safety_backup=True):
         safe_print("❌ Cancelled.")
         return False
     
-    with open(backup_filepath, 'r') as f:
-        backup = json.load(f)
-    
-    worksheet.clear()
-    worksheet.append_row(backup['metadata']['headers'])
+    headers, rows = backup_table(backup)
     
-    df = pd.DataFrame(backup['data'])
-    df = df.reindex(columns=backup['metadata']['headers'])
+    # Two RPCs total: clear the sheet, then write header + rows in one update.
+    # RAW stores values exactly as backed up (no formula/date re-parsing)
+    spreadsheet.values_clear(f"'{SHEET_NAME}'")
+    spreadsheet.values_update(
+        f"'{SHEET_NAME}'!A1",
+        params={'valueInputOption': 'RAW'},
+        body={'values': [headers] + rows}
+    )
     
-    if set_with_dataframe:
-        set_with_dataframe(worksheet, df, row=2, include_column_header=False)
-    else:
-        for i, row in df.iterrows():
-            worksheet.append_row(row.tolist())
-    
-    safe_print(f"\n🎉 Restored {len(backup['data'])} rows!")
+    safe_print(f"\n🎉 Restored {len(rows)} rows!")
     return True
 
 # %% [markdown]
@@ -561,14 +965,25 @@ def download_latest_backup():
     
     filepath = backups[0]['filepath']
     
+    # A delta only stores changed rows, so it is useless without its base
+    base_path = None
+    if is_delta_backup(filepath):
+        base_name = load_backup_metadata(filepath).get('base_backup')
+        if base_name:
+            base_path = os.path.join(BACKUP_FOLDER, base_name)
+    
     if compat.in_colab:
         from google.colab import files
         files.download(filepath)
-        csv_path = filepath.replace('.json', '.csv')
+        if base_path and os.path.exists(base_path):
+            files.download(base_path)
+        csv_path = csv_twin_path(filepath)
         if os.path.exists(csv_path):
             files.download(csv_path)
     else:
         safe_print(f"📁 Backup location: {filepath}")
+        if base_path:
+            safe_print(f"🧩 Delta base: {base_path}")
         safe_print(f"📁 Open folder: {BACKUP_FOLDER}")
 
 # %% [markdown]
@@ -585,6 +1000,7 @@ def show_menu():
 ║  detect_changes()         - Check for changes       🔄       ║
 ║  create_backup()          - Create new backup       💾       ║
 ║  list_available_backups() - See restore points      📋       ║
+║  verify_all_backups()     - Check every backup      🔐       ║
 ║  restore_from_backup(N)   - Restore backup #N       🚀       ║
 ║  download_latest_backup() - Download to computer    📤       ║
 ╚══════════════════════════════════════════════════════════════╝
@@ -30,29 +30,28 @@ if str(current_dir) not in sys.path:
     sys.path.insert(0, str(current_dir))
 
 try:
-    from colab_compat import ColabCompat, safe_print
+    from colab_compat import ColabCompat, safe_print, fetch_modified_time
 except ImportError:
     sys.path.append("tools")
-    from tools.colab_compat import ColabCompat, safe_print
+    from tools.colab_compat import ColabCompat, safe_print, fetch_modified_time
 
 # Initialize Compatibility Layer
 compat = ColabCompat()
 compat.print_environment()
-compat.ensure_packages(["matplotlib", "seaborn"])
+compat.ensure_packages()
 
 # %%
 import gspread
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import numpy as np
+import re
+import json
+from bisect import bisect_right
 from pathlib import Path
 from collections import Counter
 import warnings
 warnings.filterwarnings('ignore')
 
-plt.style.use('seaborn-v0_8-whitegrid')
-sns.set_palette("husl")
-
 safe_print("✅ Libraries imported!")
 
 # %% [markdown]
@@ -77,35 +76,101 @@ except Exception as e:
 SPREADSHEET_ID = "17NaZQTbIm8LEiO2VoQoIn5HpqGEQKGAIUXN81SGnZJQ"
 SHEET_NAME = "Shortcuts"
 OUTPUT_FOLDER = str(compat.base_path)
+# Per-user cache (never the shared temp dir); plain JSON, so loading it runs no code
+CACHE_FOLDER = Path.home() / ".cache" / "te_quality_cache"
+UNSAFE_CHARS_RE = re.compile(r'[^\w-]')
+
+def content_lengths(frame):
+    """Character count of every Content cell as one array! 📏"""
+    # Every cell is sheet text (values_get / JSON cache), so len() mapped
+    # straight over the object array: no astype(str) copy, no .str accessor
+    values = frame['Content'].to_numpy(dtype=object, na_value='')
+    return np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+
+def empty_matrix(frame):
+    """Blank cells of EVERY column at once (rows x columns booleans)! 🧮"""
+    values = frame.to_numpy(dtype=object)
+    return pd.isna(values) | (values == '')
+
+def cache_path(modified_time):
+    """Local cache file for one revision of the sheet! 🗃️"""
+    sheet_key = UNSAFE_CHARS_RE.sub('', f"{SPREADSHEET_ID}_{SHEET_NAME}")
+    return CACHE_FOLDER / sheet_key / (UNSAFE_CHARS_RE.sub('', modified_time) + ".json")
+
+def load_cache(path):
+    """The cached sheet grid for this revision, or None if unusable! 🗃️"""
+    try:
+        return json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+
+def save_cache(values, path):
+    """Keep this revision's grid locally, replacing older revisions! 💾"""
+    try:
+        # Only the current user may read or plant cache files
+        CACHE_FOLDER.mkdir(mode=0o700, parents=True, exist_ok=True)
+        path.parent.mkdir(mode=0o700, exist_ok=True)
+        for stale in path.parent.glob("*.json"):
+            stale.unlink()
+        path.write_text(json.dumps(values, ensure_ascii=False), encoding='utf-8')
+    except OSError as e:
+        safe_print(f"⚠️ Could not write cache: {e}")
+
+def frame_from_values(values):
+    """DataFrame straight from a header + rows grid (short rows padded)! 🧱"""
+    headers, rows = values[0], values[1:]
+    width = len(headers)
+    # The API trims trailing blanks, so pad short rows to the header width
+    padded = [row[:width] + [''] * (width - len(row)) for row in rows]
+    # Every cell is sheet text: declare object up front, no dtype inference
+    return pd.DataFrame(padded, columns=headers, dtype=object)
 
 # Initialize dataframe
 df = None
 
 if MOCK_MODE:
     safe_print("\n🚧 MOCK MODE: Generating dummy data for logic testing...")
-    # Create valid dummy dataframe with some intentional quality issues for testing
-    data = {
-        'Snippet Name': ['addr', '', 'sig', 'meeting', 'date'],
-        'Content': ['123 Main St', 'example@test.com', '', 'Meeting link:', '2024-01-01'],
-        'Description': ['Home address', 'Personal email', 'Signature', '', 'Current date'],
-        'MainCategory': ['Contact', 'Contact', 'Communication', 'Communication', 'Dates & Time'],
-        'Language': ['en', 'en', '', 'en', 'es']
-    }
-    df = pd.DataFrame(data)
+    # Dummy sheet grid (header + rows, as the API returns it) with some
+    # intentional quality issues for testing
+    mock_values = [
+        ['Snippet Name', 'Content', 'Description', 'MainCategory', 'Language'],
+        ['addr', '123 Main St', 'Home address', 'Contact', 'en'],
+        ['', 'example@test.com', 'Personal email', 'Contact', 'en'],
+        ['sig', '', 'Signature', 'Communication', ''],
+        ['meeting', 'Meeting link:', '', 'Communication', 'en'],
+        ['date', '2024-01-01', 'Current date', 'Dates & Time', 'es'],
+    ]
+    df = frame_from_values(mock_values)
     safe_print(f"📊 Mock Data Loaded: {len(df)} rows (with intentional empty fields)")
 
 else:
     try:
         spreadsheet = gc.open_by_key(SPREADSHEET_ID)
-        worksheet = spreadsheet.worksheet(SHEET_NAME)
-        data = worksheet.get_all_records()
-        df = pd.DataFrame(data)
-        safe_print(f"✅ Loaded {len(df)} shortcuts!")
+        # Same Drive revision as last run -> reuse its rows, skip the big fetch
+        modified_time = fetch_modified_time(spreadsheet)
+        cached = cache_path(modified_time) if modified_time else None
+        values = load_cache(cached) if cached and cached.exists() else None
+        if values is not None:
+            df = frame_from_values(values)
+            safe_print(f"⚡ Loaded {len(df)} shortcuts from cache (unchanged since {modified_time})")
+        else:
+            # One values.get call returns the raw 2D grid: no worksheet lookup,
+            # no dict per row
+            values = spreadsheet.values_get(f"'{SHEET_NAME}'").get('values', [[]])
+            df = frame_from_values(values)
+            safe_print(f"✅ Loaded {len(df)} shortcuts!")
+            if cached:
+                save_cache(values, cached)
         safe_print(f"📋 Columns: {list(df.columns)}")
     except Exception as e:
         safe_print(f"❌ Error loading spreadsheet: {e}")
         raise
 
+# Derived arrays every analyzer shares, computed ONCE right after loading
+EMPTY = pd.DataFrame(empty_matrix(df), index=df.index, columns=df.columns)
+EMPTY_COUNTS = EMPTY.sum()
+CONTENT_LENGTHS = content_lengths(df) if 'Content' in df.columns else None
+
 # %% [markdown]
 # ## Step 4: Overview Statistics 📈
 
@@ -125,9 +190,7 @@ def generate_overview():
     safe_print("-" * 60)
     
     stats = []
-    for col in df.columns:
-        filled = df[col].notna().sum()
-        empty = df[col].isna().sum() + (df[col] == '').sum()
+    for col, empty in EMPTY_COUNTS.items():
         fill_rate = (total - empty) / total * 100
         
         safe_print(f"  {col[:30]:<30} | {fill_rate:>5.1f}% filled | {empty} empty")
@@ -152,11 +215,15 @@ def analyze_missing():
     
     issues = []
     for col in available_critical:
-        missing = df[(df[col].isna()) | (df[col] == '')]
-        if len(missing) > 0:
-            safe_print(f"\n⚠️ {col}: {len(missing)} missing")
-            for idx, row in missing.head(5).iterrows():
-                issues.append({'Row': idx + 2, 'Column': col, 'Issue': 'Missing'})
+        missing = EMPTY[col].to_numpy()
+        count = int(EMPTY_COUNTS[col])
+        if count > 0:
+            safe_print(f"\n⚠️ {col}: {count} missing")
+            # Row labels straight from the mask: no sub-frame, no per-row Series
+            issues.extend(
+                {'Row': idx + 2, 'Column': col, 'Issue': 'Missing'}
+                for idx in df.index[missing][:5]
+            )
     
     if not issues:
         safe_print("\n✅ No critical missing fields!")
@@ -175,27 +242,31 @@ def analyze_content_length():
         safe_print("❌ No Content column found!")
         return
     
-    df['content_length'] = df['Content'].astype(str).str.len()
+    # Local array only: adding a helper column to df would skew completeness
+    lengths = CONTENT_LENGTHS
+    if lengths.size == 0:
+        safe_print("⚠️ No content rows to analyze!")
+        return
     
     safe_print("\n" + "=" * 60)
     safe_print("📏 CONTENT LENGTH ANALYSIS")
     safe_print("=" * 60)
     
     safe_print(f"\n📊 Statistics:")
-    safe_print(f"   Min: {df['content_length'].min()} chars")
-    safe_print(f"   Max: {df['content_length'].max()} chars")
-    safe_print(f"   Mean: {df['content_length'].mean():.1f} chars")
-    safe_print(f"   Median: {df['content_length'].median():.1f} chars")
+    safe_print(f"   Min: {lengths.min()} chars")
+    safe_print(f"   Max: {lengths.max()} chars")
+    safe_print(f"   Mean: {lengths.mean():.1f} chars")
+    safe_print(f"   Median: {np.median(lengths):.1f} chars")
     
     # Very short content (potential issues)
-    very_short = df[df['content_length'] <= 1]
-    if len(very_short) > 0:
-        safe_print(f"\n⚠️ Very short content (≤1 char): {len(very_short)} items")
+    very_short = int((lengths <= 1).sum())
+    if very_short > 0:
+        safe_print(f"\n⚠️ Very short content (≤1 char): {very_short} items")
     
     # Very long content
-    very_long = df[df['content_length'] > 500]
-    if len(very_long) > 0:
-        safe_print(f"📝 Long content (>500 chars): {len(very_long)} items")
+    very_long = int((lengths > 500).sum())
+    if very_long > 0:
+        safe_print(f"📝 Long content (>500 chars): {very_long} items")
 
 analyze_content_length()
 
@@ -203,6 +274,13 @@ analyze_content_length()
 # ## Step 7: Quality Score 🏆
 
 # %%
+# Every possible 20-cell bar, built once (one per 5% step)
+SCORE_BARS = ["█" * n + "░" * (20 - n) for n in range(21)]
+
+# Grade table: a score at or above GRADE_THRESHOLDS[i] earns GRADES[i + 1]
+GRADE_THRESHOLDS = [70, 80, 90]
+GRADES = ["C Needs Improvement 🔧", "B Fair ⚠️", "A Good! ✅", "A+ Excellent! 🌟"]
+
 def calculate_quality_score():
     """Calculate overall data quality score! 🏆"""
     safe_print("\n" + "=" * 60)
@@ -213,13 +291,14 @@ def calculate_quality_score():
     
     # Completeness (40%)
     total_cells = len(df) * len(df.columns)
-    filled_cells = df.notna().sum().sum() - (df == '').sum().sum()
+    filled_cells = total_cells - int(EMPTY_COUNTS.sum())
     completeness = filled_cells / total_cells * 100
     scores['Completeness'] = completeness
     
     # Content validity (30%)
     if 'Content' in df.columns:
-        valid_content = df['Content'].apply(lambda x: len(str(x)) > 0).sum()
+        # Vectorized length check instead of a Python lambda per row
+        valid_content = int((CONTENT_LENGTHS > 0).sum())
         content_validity = valid_content / len(df) * 100
     else:
         content_validity = 100
@@ -237,19 +316,12 @@ def calculate_quality_score():
     
     safe_print(f"\n📊 Dimension Scores:")
     for dim, score in scores.items():
-        bar = "█" * int(score / 5) + "░" * (20 - int(score / 5))
+        bar = SCORE_BARS[int(score / 5)]
         safe_print(f"   {dim:<20} [{bar}] {score:.1f}%")
     
     safe_print(f"\n🏆 OVERALL QUALITY: {overall:.1f}%")
     
-    if overall >= 90:
-        safe_print("   Grade: A+ Excellent! 🌟")
-    elif overall >= 80:
-        safe_print("   Grade: A Good! ✅")
-    elif overall >= 70:
-        safe_print("   Grade: B Fair ⚠️")
-    else:
-        safe_print("   Grade: C Needs Improvement 🔧")
+    safe_print(f"   Grade: {GRADES[bisect_right(GRADE_THRESHOLDS, overall)]}")
     
     return overall, scores
 
@@ -269,19 +341,20 @@ def generate_recommendations():
     
     # Check for missing descriptions
     if 'Description' in df.columns:
-        missing_desc = (df['Description'].isna() | (df['Description'] == '')).sum()
+        missing_desc = int(EMPTY_COUNTS['Description'])
         if missing_desc > len(df) * 0.1:
             recs.append(f"📝 Add descriptions to {missing_desc} shortcuts")
     
     # Check for missing categories
     if 'MainCategory' in df.columns:
-        missing_cat = (df['MainCategory'].isna() | (df['MainCategory'] == '')).sum()
+        missing_cat = int(EMPTY_COUNTS['MainCategory'])
         if missing_cat > 0:
             recs.append(f"🏷️ Categorize {missing_cat} uncategorized shortcuts")
     
     # Check for duplicates
     if 'Content' in df.columns:
-        dups = df['Content'].duplicated().sum()
+        # Count from the number of distinct values: no per-row boolean Series
+        dups = len(df) - df['Content'].nunique(dropna=False)
         if dups > 0:
             recs.append(f"🔍 Review {dups} duplicate content items")
     
@@ -301,7 +374,7 @@ recommendations = generate_recommendations()
 # %%
 def export_report():
     """Export quality report! 📤"""
-    report_file = os.path.join(OUTPUT_FOLDER, "data_quality_report.csv")
+    report_file = str(Path(OUTPUT_FOLDER) / "data_quality_report.csv")
     
     report_data = {
         'Metric': ['Total Records', 'Quality Score', 'Completeness', 'Content Validity', 'Uniqueness'],
@@ -312,7 +385,7 @@ def export_report():
     pd.DataFrame(report_data).to_csv(report_file, index=False)
     safe_print(f"\n✅ Report exported to: {report_file}")
     
-    if IN_COLAB:
+    if compat.in_colab:
         from google.colab import files
         files.download(report_file)
 
@@ -33,6 +33,13 @@ try:
 except ImportError:
     from tools.colab_compat import ColabCompat, safe_print
 
+# orjson (Rust) is much faster for large task/result files; stdlib json is the fallback
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -42,10 +49,14 @@ DRIVE_FOLDER_NAME = "TextExpanderBridge"
 
 # ML Configuration
 CONFIDENCE_THRESHOLD = 0.15  # Minimum confidence to assign category
+# Category names are 1-3 words, so word bigrams rarely match: char n-grams inside
+# word boundaries tolerate plurals/typos, and sublinear TF damps repeated grams
 TFIDF_MAX_FEATURES = 500
-TFIDF_NGRAM_RANGE = (1, 2)
+TFIDF_ANALYZER = 'char_wb'
+TFIDF_NGRAM_RANGE = (3, 5)
 HIGH_CONFIDENCE_THRESHOLD = 0.6  # For statistics tracking
 LOW_CONFIDENCE_THRESHOLD = 0.3   # For statistics tracking
+BATCH_SIZE = 1000  # Tasks vectorized per transform + matmul (bounds the dense similarity block)
 
 
 # ============================================================================
@@ -94,6 +105,12 @@ Examples:
         help='Disable progress indicators (useful for non-interactive environments)'
     )
     
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Indent the output JSON for reading by hand (default is compact)'
+    )
+    
     parser.add_argument(
         '--version', '-v',
         action='version',
@@ -164,6 +181,7 @@ def detect_environment() -> Dict[str, Any]:
 
 # ML dependencies - will be imported after ensure_dependencies() is called
 pd = None
+np = None
 TfidfVectorizer = None
 cosine_similarity = None
 tqdm = None  # Progress bar
@@ -175,7 +193,7 @@ def ensure_dependencies(compat: Optional[ColabCompat] = None):
     Args:
         compat: Optional ColabCompat instance for package installation
     """
-    global pd, TfidfVectorizer, cosine_similarity, tqdm
+    global pd, np, TfidfVectorizer, cosine_similarity, tqdm
     
     required = ["pandas", "scikit-learn", "tqdm"]
     missing = []
@@ -200,11 +218,13 @@ def ensure_dependencies(compat: Optional[ColabCompat] = None):
     
     # Now import ML libraries
     import pandas
+    import numpy
     from sklearn.feature_extraction.text import TfidfVectorizer as TfidfVec
     from sklearn.metrics.pairwise import cosine_similarity as cos_sim
     from tqdm import tqdm as tqdm_lib
     
     pd = pandas
+    np = numpy
     TfidfVectorizer = TfidfVec
     cosine_similarity = cos_sim
     tqdm = tqdm_lib
@@ -231,12 +251,20 @@ class TextExpanderCategorizer:
         
         self.categories = [str(c).strip() for c in available_categories if c]
         self.vectorizer = TfidfVectorizer(
-            stop_words='english',
+            analyzer=TFIDF_ANALYZER,
+            ngram_range=TFIDF_NGRAM_RANGE,
+            sublinear_tf=True,
             max_features=TFIDF_MAX_FEATURES,
-            ngram_range=TFIDF_NGRAM_RANGE
+            lowercase=True
         )
         self.confidence_threshold = confidence_threshold
         
+        # Fit the vocabulary on the categories once - they never change between tasks
+        try:
+            self.cat_matrix = self.vectorizer.fit_transform(self.categories)
+        except ValueError as e:
+            raise CategorizationError(f"❌ Categories have no usable terms: {e}")
+        
         safe_print(f"🎯 Categorizer initialized with {len(self.categories)} categories")
     
     def categorize(self, text: str, description: str = "") -> Dict[str, Any]:
@@ -246,6 +274,9 @@ class TextExpanderCategorizer:
         Args:
             text: Primary text content
             description: Optional description for better matching
+        
+        For many rows use categorize_batch(), which skips empty rows and
+        vectorizes each distinct text only once.
             
         Returns:
             {
@@ -254,71 +285,145 @@ class TextExpanderCategorizer:
                 "alternatives": List[Dict]
             }
         """
-        # Combine text and description
-        combined = f"{text} {description}".strip()
-        
-        if not combined:
+        try:
+            return self.categorize_batch([text], [description])[0]
+        except Exception as e:
+            safe_print(f"⚠️ Error categorizing '{str(text)[:30]}...': {e}")
             return {
-                "category": "❓ Uncategorized",
+                "category": "❌ Error",
                 "confidence": 0.0,
                 "alternatives": []
             }
+    
+    def categorize_batch(self, texts: List[str], descriptions: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Categorizes many texts with one transform + one sparse matmul
         
-        try:
-            # Build corpus: [input_text, category1, category2, ...]
-            corpus = [combined.lower()] + [cat.lower() for cat in self.categories]
-            tfidf_matrix = self.vectorizer.fit_transform(corpus)
-            
-            # Calculate similarities between input and each category
-            similarities = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:]).flatten()
+        Empty rows get "❓ Uncategorized" without touching the vectorizer, and
+        repeated texts (templated snippets) are scored once and share a result.
+        
+        Args:
+            texts: Primary text content per item
+            descriptions: Optional descriptions aligned with texts
             
-            # Get top 3 matches
-            top_indices = similarities.argsort()[-3:][::-1]
-            alternatives = [
-                {
-                    "category": self.categories[idx],
-                    "confidence": float(similarities[idx])
-                }
-                for idx in top_indices
-                if similarities[idx] > 0
+        Returns:
+            List of result dicts shaped like categorize()
+        """
+        if descriptions is None:
+            descriptions = [""] * len(texts)
+        
+        # Combine text and description; the vectorizer lowercases, so case-only
+        # variants are the same input
+        combined = [f"{text} {description}".strip().lower() for text, description in zip(texts, descriptions)]
+        
+        # Map each distinct non-empty text to its slot in the unique list
+        unique_slots: Dict[str, int] = {}
+        for c in combined:
+            if c and c not in unique_slots:
+                unique_slots[c] = len(unique_slots)
+        if not unique_slots:
+            return [
+                {"category": "❓ Uncategorized", "confidence": 0.0, "alternatives": []}
+                for _ in combined
             ]
-            
-            if not alternatives:
-                return {
-                    "category": "🌱 Needs Review",
-                    "confidence": 0.0,
-                    "alternatives": []
-                }
-            
-            best_match = alternatives[0]
-            
-            # Apply confidence threshold
-            if best_match["confidence"] < self.confidence_threshold:
-                return {
-                    "category": "🌱 Needs Review",
-                    "confidence": best_match["confidence"],
-                    "alternatives": alternatives
-                }
-            
-            return {
-                "category": best_match["category"],
-                "confidence": best_match["confidence"],
-                "alternatives": alternatives[1:] if len(alternatives) > 1 else []
+        
+        # Both sides are L2-normalized, so the dot product is the cosine similarity
+        input_matrix = self.vectorizer.transform(list(unique_slots))
+        similarities = (input_matrix @ self.cat_matrix.T).toarray()
+        
+        # Get top 3 matches per row: O(K) partition, then sort only those 3
+        n_cats = similarities.shape[1]
+        k = min(3, n_cats)
+        if k < n_cats:
+            top_indices = np.argpartition(similarities, n_cats - k, axis=1)[:, -k:]
+        else:
+            top_indices = np.broadcast_to(np.arange(k), similarities.shape)
+        top_scores = np.take_along_axis(similarities, top_indices, axis=1)
+        top_indices = np.take_along_axis(top_indices, np.argsort(-top_scores, axis=1), axis=1)
+        
+        unique_results = [self._build_result(sims, top) for sims, top in zip(similarities, top_indices)]
+        
+        # Scatter back to the original rows
+        return [
+            unique_results[unique_slots[c]] if c else
+            {"category": "❓ Uncategorized", "confidence": 0.0, "alternatives": []}
+            for c in combined
+        ]
+    
+    def _build_result(self, similarities, top_indices) -> Dict[str, Any]:
+        """Turn one row of similarities + its top indices into a result dict"""
+        alternatives = [
+            {
+                "category": self.categories[idx],
+                "confidence": float(similarities[idx])
             }
-            
-        except Exception as e:
-            safe_print(f"⚠️ Error categorizing '{text[:30]}...': {e}")
+            for idx in top_indices
+            if similarities[idx] > 0
+        ]
+        
+        if not alternatives:
             return {
-                "category": "❌ Error",
+                "category": "🌱 Needs Review",
                 "confidence": 0.0,
                 "alternatives": []
             }
+        
+        best_match = alternatives[0]
+        
+        # Apply confidence threshold
+        if best_match["confidence"] < self.confidence_threshold:
+            return {
+                "category": "🌱 Needs Review",
+                "confidence": best_match["confidence"],
+                "alternatives": alternatives
+            }
+        
+        return {
+            "category": best_match["category"],
+            "confidence": best_match["confidence"],
+            "alternatives": alternatives[1:] if len(alternatives) > 1 else []
+        }
 
 
 # ============================================================================
 # BATCH PROCESSING - HELPER FUNCTIONS
 # ============================================================================
 
+def _dump_json_bytes(data: Dict[str, Any], pretty: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes (orjson when available), compact unless pretty"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else None)
+    if pretty:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _write_json(path: str, data: Dict[str, Any], pretty: bool = False) -> None:
+    """
+    Write JSON in one buffered write to a temp file, then swap it into place.
+    
+    Apps Script polls the Drive folder, so it must never see a half-synced file.
+    
+    Args:
+        path: Destination file path
+        data: JSON-serializable dict
+        pretty: Indent the output for reading by hand
+    """
+    payload = _dump_json_bytes(data, pretty)
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Don't leave a partial temp file behind in the synced folder
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 def _load_and_validate_input(input_path: str) -> Dict[str, Any]:
     """
     Load and validate input JSON file.
@@ -338,8 +443,8 @@ def _load_and_validate_input(input_path: str) -> Dict[str, Any]:
     if not os.path.exists(input_path):
         raise FileNotFoundError(f"Input file not found: {input_path}")
     
-    with open(input_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    raw = Path(input_path).read_bytes()
+    data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
     
     # Validate input structure
     required_keys = ['availableCategories', 'tasks']
@@ -354,6 +459,27 @@ def _load_and_validate_input(input_path: str) -> Dict[str, Any]:
     return data
 
 
+def _categorize_task(
+    categorizer: 'TextExpanderCategorizer',
+    task: Dict
+) -> Optional[Dict[str, Any]]:
+    """
+    Categorize a single task, returning None if it cannot be processed.
+    
+    Args:
+        categorizer: Initialized TextExpanderCategorizer instance
+        task: Task dict with 'text' and optional 'description'
+        
+    Returns:
+        Categorization result dict, or None on error
+    """
+    try:
+        return categorizer.categorize(task.get('text', ''), task.get('description', ''))
+    except Exception as e:
+        safe_print(f"⚠️ Error on row {task.get('rowId', '?')}: {e}")
+        return None
+
+
 def _process_tasks(
     categorizer: 'TextExpanderCategorizer',
     tasks: List[Dict],
@@ -372,53 +498,60 @@ def _process_tasks(
     Returns:
         List of result dicts
     """
-    results = []
     total = len(tasks)
     
     safe_print(f"\n🔄 Processing {total} items...")
     
     # Use tqdm for progress bar (disable for non-interactive or if requested)
-    task_iterator = tqdm(
-        enumerate(tasks, 1),
+    progress = tqdm(
         total=total,
         desc="   🔄 Categorizing",
         disable=not show_progress,
         bar_format='{desc}: {percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]'
     )
     
-    for idx, task in task_iterator:
+    # Vectorize in chunks: one transform + one matmul per chunk instead of per task
+    categorized: List[Optional[Dict[str, Any]]] = []
+    for start in range(0, total, BATCH_SIZE):
+        chunk = tasks[start:start + BATCH_SIZE]
         try:
-            result = categorizer.categorize(
-                task.get('text', ''),
-                task.get('description', '')
+            chunk_results = categorizer.categorize_batch(
+                [task.get('text', '') for task in chunk],
+                [task.get('description', '') for task in chunk]
             )
-            
-            results.append({
-                "rowId": task.get('rowId', idx),  # Use idx as fallback if rowId missing
-                "originalText": str(task.get('text', ''))[:100],
-                "suggestedCategory": result['category'],
-                "confidence": round(result['confidence'], 4),
-                "alternatives": result['alternatives'][:2]  # Keep top 2 alternatives
-            })
-            
-            # Track confidence stats using configurable thresholds
-            if result['confidence'] >= HIGH_CONFIDENCE_THRESHOLD:
-                stats["high_confidence"] += 1
-            elif result['confidence'] < LOW_CONFIDENCE_THRESHOLD:
-                stats["low_confidence"] += 1
-                
         except Exception as e:
-            safe_print(f"⚠️ Error on row {task.get('rowId', '?')}: {e}")
-            stats["errors"] += 1
-            results.append({
-                "rowId": task.get('rowId', idx),  # Use idx as fallback
-                "originalText": str(task.get('text', ''))[:50],
-                "suggestedCategory": "❌ Processing Error",
-                "confidence": 0.0,
-                "alternatives": []
-            })
-    
-    return results
+            # Retry the chunk row by row so one bad row cannot fail its neighbours
+            safe_print(f"⚠️ Batch error on rows {start + 1}-{start + len(chunk)}: {e} (retrying row by row)")
+            chunk_results = [_categorize_task(categorizer, task) for task in chunk]
+        categorized.extend(chunk_results)
+        progress.update(len(chunk))
+    
+    progress.close()
+    
+    # Track confidence stats using configurable thresholds, over whole arrays
+    ok = np.array([result is not None for result in categorized], dtype=bool)
+    confidences = np.array([result['confidence'] if result is not None else 0.0 for result in categorized])
+    stats["errors"] += int(np.count_nonzero(~ok))
+    stats["high_confidence"] += int(np.count_nonzero(ok & (confidences >= HIGH_CONFIDENCE_THRESHOLD)))
+    stats["low_confidence"] += int(np.count_nonzero(ok & (confidences < LOW_CONFIDENCE_THRESHOLD)))
+    rounded = np.round(confidences, 4).tolist()
+    
+    return [
+        {
+            "rowId": task.get('rowId', idx),  # Use idx as fallback if rowId missing
+            "originalText": str(task.get('text', ''))[:100],
+            "suggestedCategory": result['category'],
+            "confidence": confidence,
+            "alternatives": result['alternatives'][:2]  # Keep top 2 alternatives
+        } if result is not None else {
+            "rowId": task.get('rowId', idx),  # Use idx as fallback
+            "originalText": str(task.get('text', ''))[:50],
+            "suggestedCategory": "❌ Processing Error",
+            "confidence": 0.0,
+            "alternatives": []
+        }
+        for idx, (task, result, confidence) in enumerate(zip(tasks, categorized, rounded), 1)
+    ]
 
 
 def _write_output(
@@ -426,7 +559,8 @@ def _write_output(
     results: List[Dict],
     stats: Dict[str, int],
     source_spreadsheet_id: str,
-    dry_run: bool = False
+    dry_run: bool = False,
+    pretty: bool = False
 ) -> None:
     """
     Write results to output file (or preview in dry-run mode).
@@ -437,6 +571,7 @@ def _write_output(
         stats: Stats dict with counts
         source_spreadsheet_id: Original spreadsheet ID
         dry_run: If True, only preview without writing
+        pretty: If True, indent the JSON output
     """
     output_data = {
         "processedAt": datetime.now().isoformat(),
@@ -459,8 +594,7 @@ def _write_output(
         # Ensure output directory exists
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+        _write_json(output_path, output_data, pretty)
 
 
 def _print_summary(
@@ -502,7 +636,8 @@ def _print_summary(
 # BATCH PROCESSING - MAIN ORCHESTRATOR
 # ============================================================================
 
-def process_batch(input_path: str, output_path: str, dry_run: bool = False, show_progress: bool = True) -> Dict[str, Any]:
+def process_batch(input_path: str, output_path: str, dry_run: bool = False, show_progress: bool = True,
+                  pretty: bool = False) -> Dict[str, Any]:
     """
     Main processing pipeline for batch categorization.
     
@@ -514,6 +649,7 @@ def process_batch(input_path: str, output_path: str, dry_run: bool = False, show
         output_path: Path to write results_latest.json
         dry_run: If True, preview results without writing to file
         show_progress: If True, show progress indicators
+        pretty: If True, indent the JSON output
         
     Returns:
         Summary dict with processing stats
@@ -553,7 +689,8 @@ def process_batch(input_path: str, output_path: str, dry_run: bool = False, show
             results=results,
             stats=stats,
             source_spreadsheet_id=data.get('spreadsheetId', ''),
-            dry_run=dry_run
+            dry_run=dry_run,
+            pretty=pretty
         )
         
         stats["success"] = True
@@ -577,11 +714,10 @@ def process_batch(input_path: str, output_path: str, dry_run: bool = False, show
         # Write error to output file (unless dry-run)
         if not dry_run:
             try:
-                with open(output_path, 'w', encoding='utf-8') as f:
-                    json.dump({
-                        "error": str(e),
-                        "timestamp": datetime.now().isoformat()
-                    }, f, indent=2)
+                _write_json(output_path, {
+                    "error": str(e),
+                    "timestamp": datetime.now().isoformat()
+                })
             except (IOError, OSError) as write_error:
                 safe_print(f"⚠️ Could not write error file: {write_error}")
         
@@ -605,13 +741,14 @@ def mount_drive():
         print(f"❌ Mount error: {e}")
 
 
-def run_categorization(dry_run: bool = False, show_progress: bool = True):
+def run_categorization(dry_run: bool = False, show_progress: bool = True, pretty: bool = False):
     """
     Main entry point - detect environment and run categorization.
     
     Args:
         dry_run: If True, preview results without writing to file
         show_progress: If True, show progress indicators
+        pretty: If True, indent the JSON output
     
     Returns:
         Dict with processing stats, or None if cannot proceed
@@ -636,7 +773,8 @@ def run_categorization(dry_run: bool = False, show_progress: bool = True):
         safe_print("   Run '🚀 Trigger Categorization' from Google Sheet first.")
         return None
     
-    return process_batch(env["input_file"], env["output_file"], dry_run=dry_run, show_progress=show_progress)
+    return process_batch(env["input_file"], env["output_file"], dry_run=dry_run, show_progress=show_progress,
+                         pretty=pretty)
 
 
 # ============================================================================
@@ -656,9 +794,12 @@ if __name__ == "__main__":
     if args.input and args.output:
         safe_print(f"📥 Custom input: {args.input}")
         safe_print(f"📤 Custom output: {args.output}")
+        ensure_dependencies()
         process_batch(args.input, args.output, 
                      dry_run=args.dry_run, 
-                     show_progress=not args.no_progress)
+                     show_progress=not args.no_progress,
+                     pretty=args.pretty)
     else:
         run_categorization(dry_run=args.dry_run, 
-                          show_progress=not args.no_progress)
+                          show_progress=not args.no_progress,
+                          pretty=args.pretty)
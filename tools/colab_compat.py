@@ -18,8 +18,32 @@ Usage:
 import sys
 import os
 import subprocess
+import importlib.util
 from pathlib import Path
 
+# Import names for pip packages whose module name differs from the package name
+PACKAGE_IMPORT_NAMES = {
+    "gspread-dataframe": "gspread_dataframe",
+    "google-auth": "google.auth",
+    "google-auth-oauthlib": "google_auth_oauthlib",
+    "scikit-learn": "sklearn",
+}
+
+
+def is_package_installed(pkg):
+    """
+    Check whether a pip package is importable without importing it! 🔍
+    
+    Uses importlib.util.find_spec so heavy packages (plotly, seaborn...)
+    are not initialized just to test for their presence.
+    """
+    module_name = PACKAGE_IMPORT_NAMES.get(pkg, pkg.replace("-", "_"))
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        # Parent package missing (e.g. "google" for "google.auth")
+        return False
+
 # Fix Windows console encoding for emojis
 def safe_print(text):
     """Print with fallback for Windows console encoding issues."""
@@ -31,6 +55,23 @@ def safe_print(text):
         clean_text = re.sub(r'[\U0001F000-\U0001F9FF\U00002700-\U000027BF]', '', text)
         print(clean_text)
 
+# Drive v3 file metadata endpoint (gspread's authorized session can call it)
+DRIVE_FILES_URL = "https://www.googleapis.com/drive/v3/files/{}"
+
+
+def fetch_modified_time(spreadsheet):
+    """Ask Drive when a spreadsheet last changed (one tiny RPC)! 🕒"""
+    try:
+        response = spreadsheet.client.request(
+            'get',
+            DRIVE_FILES_URL.format(spreadsheet.id),
+            params={'fields': 'modifiedTime', 'supportsAllDrives': True}
+        )
+        return response.json().get('modifiedTime')
+    except Exception as e:
+        safe_print(f"   ⚠️ Could not read last-modified time: {e}")
+        return None
+
 # Set UTF-8 mode for Windows if possible
 if sys.platform == 'win32':
     try:
@@ -117,14 +158,8 @@ class ColabCompat:
         if additional_packages:
             required.extend(additional_packages)
         
-        # Check which packages need installation
-        missing = []
-        for pkg in required:
-            pkg_name = pkg.replace("-", "_")  # Handle package name variations
-            try:
-                __import__(pkg_name if pkg != "gspread-dataframe" else "gspread_dataframe")
-            except ImportError:
-                missing.append(pkg)
+        # Check which packages need installation (one batched pip call below)
+        missing = [pkg for pkg in required if not is_package_installed(pkg)]
         
         if missing:
             self.install_packages(missing)
@@ -0,0 +1,288 @@
+"""
+🧪 Unit Tests for BackupSystem rotation and checksums
+
+pytest tests for backup file naming, rotation and checksums in BackupSystem.py.
+BackupSystem.py is a Colab-style script that authenticates and connects at
+import time, so these tests load only its imports, constants and functions
+and point them at an in-memory spreadsheet and a temporary backup folder.
+
+Run with: pytest tools/tests/test_backup_rotation.py -v
+"""
+
+import ast
+import os
+import sys
+import types
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add tools directory to path for imports
+tools_dir = Path(__file__).resolve().parent.parent
+if str(tools_dir) not in sys.path:
+    sys.path.insert(0, str(tools_dir))
+
+BACKUP_SCRIPT = tools_dir / "BackupSystem.py"
+
+
+# ============================================================================
+# FAKES
+# ============================================================================
+
+class FakeResponse:
+    """Minimal requests-style response."""
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+class FakeClient:
+    """gspread client stand-in answering the Drive modifiedTime lookup."""
+
+    def request(self, method, url, params=None, **kwargs):
+        return FakeResponse({'modifiedTime': '2026-01-01T00:00:00.000Z'})
+
+
+class FakeSpreadsheet:
+    """In-memory spreadsheet exposing the values API BackupSystem uses."""
+
+    id = "fake-spreadsheet-id"
+    title = "Fake Shortcuts"
+
+    def __init__(self, values):
+        self.values = values
+        self.client = FakeClient()
+
+    def values_get(self, rng, params=None):
+        return {'range': rng, 'values': [list(row) for row in self.values]}
+
+    def values_batch_get(self, ranges, params=None):
+        return {'valueRanges': [self.values_get(r, params) for r in ranges]}
+
+
+def _is_constant(node):
+    return isinstance(node, ast.Assign) and all(
+        isinstance(t, ast.Name) and t.id.isupper() for t in node.targets
+    )
+
+
+def load_backup_functions(spreadsheet, backup_folder):
+    """Execute only the imports, constants and defs of BackupSystem.py."""
+    tree = ast.parse(BACKUP_SCRIPT.read_text(encoding='utf-8'))
+    ns = {'__name__': 'backup_under_test', '__file__': str(BACKUP_SCRIPT)}
+    for node in tree.body:
+        keep = isinstance(node, (ast.Import, ast.ImportFrom, ast.FunctionDef, ast.ClassDef)) or _is_constant(node)
+        keep = keep or (isinstance(node, ast.Try) and all(
+            isinstance(b, (ast.Import, ast.ImportFrom)) or _is_constant(b) for b in node.body
+        ))
+        if not keep:
+            continue
+        try:
+            exec(compile(ast.Module(body=[node], type_ignores=[]), str(BACKUP_SCRIPT), 'exec'), ns)
+        except (ImportError, NameError, AttributeError):
+            # Colab-only imports and constants derived from the live connection
+            pass
+    ns.update({
+        'spreadsheet': spreadsheet,
+        'compat': types.SimpleNamespace(in_colab=False),
+        'safe_print': lambda *args, **kwargs: None,
+        'BACKUP_FOLDER': str(backup_folder),
+    })
+    return ns
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def sheet():
+    """Small sheet with enough rows that a one-row edit stays a delta."""
+    values = [['Snippet Name', 'Content', 'MainCategory']]
+    values += [[f'snip{i}', f'content {i}', 'General'] for i in range(20)]
+    return FakeSpreadsheet(values)
+
+
+@pytest.fixture
+def backup_ns(sheet, tmp_path):
+    """BackupSystem functions bound to the fake sheet and a temp folder."""
+    ns = load_backup_functions(sheet, tmp_path)
+
+    # One distinct timestamp per backup so filenames never collide
+    clock = {'now': datetime(2026, 1, 1)}
+
+    class SteppingDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            clock['now'] += timedelta(minutes=1)
+            return clock['now']
+
+    ns['datetime'] = SteppingDatetime
+    # Rotation is exercised explicitly via cleanup_old_backups()
+    ns['MAX_BACKUPS_TO_KEEP'] = 100
+    return ns
+
+
+def make_backup(ns, step, **kwargs):
+    """Create a backup and give it a distinct, increasing mtime."""
+    path = ns['create_backup'](include_csv=True, **kwargs)
+    stamp = 1_700_000_000 + step * 60
+    for twin in (path, ns['csv_twin_path'](path)):
+        if os.path.exists(twin):
+            os.utime(twin, (stamp, stamp))
+    return path
+
+
+# ============================================================================
+# ROTATION TESTS
+# ============================================================================
+
+class TestBackupRotation:
+    """Tests for CSV twins surviving or leaving with their backups."""
+
+    def test_delta_csv_shares_backup_stem(self, backup_ns, sheet):
+        """Test that a delta backup's CSV is named after the delta JSON."""
+        make_backup(backup_ns, 0)
+        sheet.values[3][1] = 'edited'
+        delta_path = make_backup(backup_ns, 1)
+
+        assert backup_ns['is_delta_backup'](delta_path)
+        assert os.path.exists(backup_ns['csv_twin_path'](delta_path))
+
+    def test_rotation_leaves_no_orphaned_csv(self, backup_ns, sheet, tmp_path):
+        """Test that every CSV left after rotation belongs to a kept backup."""
+        make_backup(backup_ns, 0)
+        for step in range(1, 4):
+            sheet.values[step][1] = f'edit {step}'
+            make_backup(backup_ns, step)
+
+        backup_ns['MAX_BACKUPS_TO_KEEP'] = 1
+        backup_ns['cleanup_old_backups']()
+
+        kept_stems = {backup_ns['backup_stem'](f) for f, _, _ in backup_ns['scan_backups']()}
+        csv_stems = {name[:-len('.csv')] for name in os.listdir(tmp_path) if name.endswith('.csv')}
+
+        assert csv_stems
+        assert csv_stems <= kept_stems
+
+
+class TestDeltaChainRotation:
+    """Tests that rotation never strands a kept delta without its base."""
+
+    def test_kept_delta_keeps_expired_base(self, backup_ns, sheet):
+        """Test that the newest expired delta goes but its shared base stays."""
+        full_path = make_backup(backup_ns, 0)
+        sheet.values[1][1] = 'edit 1'
+        old_delta = make_backup(backup_ns, 1)
+        sheet.values[2][1] = 'edit 2'
+        new_delta = make_backup(backup_ns, 2)
+
+        backup_ns['MAX_BACKUPS_TO_KEEP'] = 1
+        backup_ns['cleanup_old_backups']()
+
+        assert backup_ns['is_delta_backup'](new_delta)
+        assert not os.path.exists(old_delta)
+        assert os.path.exists(full_path)
+        headers, rows = backup_ns['backup_table'](backup_ns['load_json_file'](new_delta))
+        assert [headers] + rows == sheet.values
+
+    def test_expired_chain_removed_when_nothing_needs_it(self, backup_ns, sheet):
+        """Test that an expired delta and its expired base both go."""
+        old_full = make_backup(backup_ns, 0)
+        sheet.values[1][1] = 'edit 1'
+        old_delta = make_backup(backup_ns, 1)
+        sheet.values[2][1] = 'edit 2'
+        new_full = make_backup(backup_ns, 2, full=True)
+
+        backup_ns['MAX_BACKUPS_TO_KEEP'] = 1
+        backup_ns['cleanup_old_backups']()
+
+        assert backup_ns['is_delta_backup'](old_delta)
+        assert not os.path.exists(old_delta)
+        assert not os.path.exists(old_full)
+        assert [f for f, _, _ in backup_ns['scan_backups']()] == [os.path.basename(new_full)]
+
+    def test_base_kept_when_mtimes_are_out_of_order(self, backup_ns, sheet):
+        """Test that a kept delta's base survives even if a newer full looks older."""
+        base_full = make_backup(backup_ns, 0)
+        sheet.values[1][1] = 'edit 1'
+        delta = make_backup(backup_ns, 2)
+        later_full = make_backup(backup_ns, 1, full=True, force=True)
+
+        backup_ns['MAX_BACKUPS_TO_KEEP'] = 1
+        backup_ns['cleanup_old_backups']()
+
+        assert os.path.exists(delta)
+        assert os.path.exists(base_full)
+        assert not os.path.exists(later_full)
+        headers, rows = backup_ns['backup_table'](backup_ns['load_json_file'](delta))
+        assert [headers] + rows == sheet.values
+
+
+# ============================================================================
+# CHECKSUM TESTS
+# ============================================================================
+
+class TestBackupChecksum:
+    """Tests for the rows-* integrity checksums of v3 backups."""
+
+    @pytest.mark.parametrize("algorithm", ['rows-blake2b', 'rows-xxh3'])
+    @pytest.mark.parametrize("value,text", [(1, '1'), (True, 'True'), (1.5, '1.5')])
+    def test_checksum_tells_types_apart(self, backup_ns, algorithm, value, text):
+        """Test that a number and its text form never share a checksum."""
+        if algorithm not in backup_ns['CHECKSUM_HASHERS']:
+            pytest.skip("xxhash not installed")
+        checksum = backup_ns['calculate_checksum']
+        payload = backup_ns['table_payload']
+
+        assert checksum(payload(['Count'], [[value]]), algorithm) != checksum(payload(['Count'], [[text]]), algorithm)
+
+    def test_checksum_separates_rows(self, backup_ns):
+        """Test that moving a value across a row boundary changes the checksum."""
+        checksum = backup_ns['calculate_checksum']
+        payload = backup_ns['table_payload']
+        algorithm = backup_ns['CHECKSUM_ALGORITHM']
+
+        assert checksum(payload(['A'], [['x'], ['y']]), algorithm) != checksum(payload(['A'], [['x', 'y']]), algorithm)
+
+    def test_new_backup_verifies(self, backup_ns, sheet):
+        """Test that a fresh full and delta backup pass verify_backup()."""
+        sheet.values[1][2] = 7
+        full_path = make_backup(backup_ns, 0)
+        sheet.values[2][2] = 2.5
+        delta_path = make_backup(backup_ns, 1)
+
+        assert backup_ns['verify_backup'](full_path)
+        assert backup_ns['verify_backup'](delta_path)
+
+
+
+class TestSkipUnchanged:
+    """Tests for create_backup() skipping writes when nothing changed."""
+
+    def test_unchanged_sheet_reuses_latest_backup(self, backup_ns):
+        """Test that a second backup of the same data writes nothing."""
+        first = make_backup(backup_ns, 0)
+
+        assert backup_ns['create_backup'](include_csv=True) == first
+        assert len(backup_ns['scan_backups']()) == 1
+
+    @pytest.mark.parametrize("value,text", [(1, '1'), (True, 'True')])
+    def test_type_only_change_is_backed_up(self, backup_ns, sheet, value, text):
+        """Test that a number turning into text still counts as a change."""
+        sheet.values[1][2] = value
+        first = make_backup(backup_ns, 0)
+        sheet.values[1][2] = text
+        second = make_backup(backup_ns, 1)
+
+        assert second != first
+        headers, rows = backup_ns['backup_table'](backup_ns['load_json_file'](second))
+        assert rows[0][2] == text
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
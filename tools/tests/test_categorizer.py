@@ -8,6 +8,7 @@ Run with: pytest tools/tests/test_categorizer.py -v
 """
 
 import pytest
+import json
 import sys
 from pathlib import Path
 
@@ -24,6 +25,8 @@ from DriveCategorizerBridge import (
     HIGH_CONFIDENCE_THRESHOLD,
     LOW_CONFIDENCE_THRESHOLD,
     ensure_dependencies,
+    _write_json,
+    _process_tasks,
 )
 
 # Initialize ML dependencies before tests run
@@ -97,6 +100,11 @@ class TestCategorizerInit:
         categorizer = TextExpanderCategorizer(single)
         
         assert len(categorizer.categories) == 1
+    
+    def test_init_with_blank_categories_raises_error(self):
+        """Test that categories with no usable terms raise CategorizationError."""
+        with pytest.raises(CategorizationError):
+            TextExpanderCategorizer(["   ", "\t"])
 
 
 # ============================================================================
@@ -166,6 +174,112 @@ class TestCategorization:
             assert 0.0 <= result["confidence"] <= 1.0
 
 
+# ============================================================================
+# BATCH CATEGORIZATION TESTS
+# ============================================================================
+
+class TestBatchCategorization:
+    """Tests for the categorize_batch() method."""
+    
+    def test_batch_matches_single_categorize(self, categorizer):
+        """Test that batch results equal calling categorize() per text."""
+        texts = ["email address", "January 2024", "Hello there!", "12345", "→ arrow"]
+        
+        batch = categorizer.categorize_batch(texts)
+        single = [categorizer.categorize(text) for text in texts]
+        
+        assert batch == single
+    
+    def test_batch_with_descriptions(self, categorizer):
+        """Test that descriptions are combined per row like categorize()."""
+        batch = categorizer.categorize_batch(["addr", "sig"], ["email address", "greeting"])
+        
+        assert batch[0] == categorizer.categorize("addr", "email address")
+        assert batch[1] == categorizer.categorize("sig", "greeting")
+    
+    def test_batch_empty_list(self, categorizer):
+        """Test that an empty batch returns an empty list."""
+        assert categorizer.categorize_batch([]) == []
+    
+    def test_batch_blank_strings(self, categorizer):
+        """Test that blank rows are Uncategorized without affecting others."""
+        results = categorizer.categorize_batch(["", "   ", "Dates and Time"])
+        
+        assert results[0]["category"] == "❓ Uncategorized"
+        assert results[1]["category"] == "❓ Uncategorized"
+        assert results[0]["confidence"] == 0.0
+        assert results[2] == categorizer.categorize("Dates and Time")
+    
+    def test_batch_duplicates_scatter_to_each_row(self, categorizer):
+        """Test that repeated texts get the same result at every index."""
+        texts = ["Dates and Time", "hello greeting", "dates and time", "Dates and Time", "hello greeting"]
+        
+        results = categorizer.categorize_batch(texts)
+        
+        assert len(results) == len(texts)
+        assert results[0] == results[2] == results[3] == categorizer.categorize("Dates and Time")
+        assert results[1] == results[4] == categorizer.categorize("hello greeting")
+        assert results[0] != results[1]
+    
+    @pytest.mark.parametrize("categories,expected", [
+        (["Only One Category"], [
+            ("Only One Category", []),
+            ("Only One Category", []),
+            ("🌱 Needs Review", []),
+        ]),
+        (["Alpha Category", "Beta Category"], [
+            ("Alpha Category", ["Beta Category"]),
+            ("Beta Category", ["Alpha Category"]),
+            ("🌱 Needs Review", []),
+        ]),
+    ])
+    def test_batch_fewer_than_three_categories(self, categories, expected):
+        """Test top-k selection when there are fewer categories than k."""
+        categorizer = TextExpanderCategorizer(categories, confidence_threshold=0.0)
+        
+        results = categorizer.categorize_batch(["alpha category", "beta category", "zzz"])
+        
+        assert [
+            (result["category"], [alt["category"] for alt in result["alternatives"]])
+            for result in results
+        ] == expected
+        for result in results:
+            ranked = [result["confidence"]] + [alt["confidence"] for alt in result["alternatives"]]
+            assert ranked == sorted(ranked, reverse=True)
+
+
+class TestProcessTasks:
+    """Tests for chunked processing in _process_tasks()."""
+    
+    def test_failed_chunk_falls_back_per_task(self, categorizer, monkeypatch):
+        """Test that a chunk error only fails the row that cannot be categorized."""
+        def fail_batch(texts, descriptions=None):
+            raise ValueError("batch failed")
+        
+        def categorize(text, description=""):
+            if text == "bad row":
+                raise ValueError("bad row")
+            return original(text, description)
+        
+        original = categorizer.categorize
+        monkeypatch.setattr(categorizer, "categorize_batch", fail_batch)
+        monkeypatch.setattr(categorizer, "categorize", categorize)
+        tasks = [
+            {"rowId": 2, "text": "Dates and Time"},
+            {"rowId": 3, "text": "bad row"},
+            {"rowId": 4, "text": "hello greeting"},
+        ]
+        stats = {"high_confidence": 0, "low_confidence": 0, "errors": 0}
+        
+        results = _process_tasks(categorizer, tasks, stats, show_progress=False)
+        
+        assert [r["rowId"] for r in results] == [2, 3, 4]
+        assert results[0]["suggestedCategory"] == original("Dates and Time")["category"]
+        assert results[1]["suggestedCategory"] == "❌ Processing Error"
+        assert results[2]["suggestedCategory"] == original("hello greeting")["category"]
+        assert stats["errors"] == 1
+
+
 # ============================================================================
 # CONFIDENCE THRESHOLD TESTS
 # ============================================================================
@@ -240,6 +354,49 @@ class TestEdgeCases:
         assert result is not None
 
 
+# ============================================================================
+# OUTPUT FILE TESTS
+# ============================================================================
+
+class TestWriteJson:
+    """Tests for the atomic JSON writer used for results_latest.json."""
+    
+    def test_write_json_complete_file_no_tmp(self, tmp_path):
+        """Test that the output parses completely and no .tmp file is left."""
+        output = tmp_path / "results_latest.json"
+        data = {"results": [{"rowId": i, "suggestedCategory": "📅 Dates & Time"} for i in range(50)]}
+        
+        _write_json(str(output), data)
+        
+        assert json.loads(output.read_text(encoding='utf-8')) == data
+        assert [p.name for p in tmp_path.iterdir()] == ["results_latest.json"]
+    
+    def test_write_json_replaces_existing_file(self, tmp_path):
+        """Test that rewriting swaps in the new content in full."""
+        output = tmp_path / "results_latest.json"
+        _write_json(str(output), {"results": list(range(1000))})
+        
+        _write_json(str(output), {"error": "short"}, pretty=True)
+        
+        assert json.loads(output.read_text(encoding='utf-8')) == {"error": "short"}
+        assert not (tmp_path / "results_latest.json.tmp").exists()
+    
+    def test_write_json_failure_removes_tmp(self, tmp_path, monkeypatch):
+        """Test that a failed swap leaves the old file and no .tmp behind."""
+        output = tmp_path / "results_latest.json"
+        _write_json(str(output), {"results": [1, 2, 3]})
+        
+        def fail_replace(src, dst):
+            raise OSError("disk full")
+        
+        monkeypatch.setattr("DriveCategorizerBridge.os.replace", fail_replace)
+        with pytest.raises(OSError, match="disk full"):
+            _write_json(str(output), {"results": []})
+        
+        assert json.loads(output.read_text(encoding='utf-8')) == {"results": [1, 2, 3]}
+        assert [p.name for p in tmp_path.iterdir()] == ["results_latest.json"]
+
+
 # ============================================================================
 # INTEGRATION TESTS
 # ============================================================================